@@ -0,0 +1,12 @@
+"""
+Benchmarks for the load, query and render hot paths.
+
+Run with `python -m benchmarks.run --help` from the repository root.
+"""
+import os
+import sys
+
+# The application modules live in src/ and import each other by module name
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
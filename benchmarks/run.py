@@ -0,0 +1,192 @@
+import argparse
+import gc
+import itertools
+import json
+import os
+import platform
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.synthetic import dataset_name, generate_dataset
+
+from data_handler import DataHandler
+from sorted_view import SortedView
+
+# countries x indicators x years of the generated datasets
+SIZES = {
+    'small': (200, 10, 20),
+    'medium': (5_000, 20, 40),
+    'large': (50_000, 20, 60),
+}
+
+
+def measure(func, repeat: int = 5) -> dict:
+    """Time func repeat times, then run it once more under tracemalloc for its peak memory."""
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'min_s': min(timings),
+        'median_s': statistics.median(timings),
+        'peak_bytes': peak,
+    }
+
+
+def data_benchmarks(csv_path: str, repeat: int) -> dict:
+    """Benchmarks of the data layer: load, delta query and sort toggling."""
+    results = {}
+
+    results['load_file'] = measure(lambda: DataHandler().load_file(csv_path, use_cache=False), repeat)
+
+    handler = DataHandler(cache_size=0)
+    handler.load_file(csv_path, use_cache=False)
+    indicator = handler.get_indicators()[0]
+    years = handler.get_years_columns()
+
+    results['get_delta_df'] = measure(lambda: handler.get_delta_df(indicator, years[0], years[-1]), repeat)
+
+    cached = DataHandler()
+    cached.set_dataset(handler.dataset)
+    cached.get_delta_df(indicator, years[0], years[-1])
+    results['get_delta_df_cached'] = measure(lambda: cached.get_delta_df(indicator, years[0], years[-1]), repeat)
+
+    ranges = [(years[i], years[j]) for i in range(0, len(years), 5) for j in range(i + 1, len(years), 5)]
+    results['get_delta_batch'] = measure(lambda: handler.get_delta_batch(indicator, ranges), repeat)
+
+    delta_df = handler.get_delta_df(indicator, years[0], years[-1])
+    results['sorted_view_build'] = measure(lambda: SortedView(delta_df), repeat)
+
+    view = SortedView(delta_df)
+    results['toggle_sort'] = measure(lambda: view.toggle(3), repeat)
+
+    return results
+
+
+def gui_benchmarks(csv_path: str, repeat: int) -> dict:
+    """
+    Benchmarks of GUI.display_datas. Needs a display: when DISPLAY is not set,
+    a virtual one is started with pyvirtualdisplay (Xvfb) if it is installed.
+    Returns an empty dict when no display is available.
+    """
+    display = None
+    if not os.environ.get('DISPLAY') and platform.system() == 'Linux':
+        try:
+            from pyvirtualdisplay import Display
+            display = Display(visible=False, size=(1280, 1024))
+            display.start()
+        except Exception as e:
+            print(f"Skipping GUI benchmarks: no display available ({e})")
+            return {}
+
+    try:
+        from controller import AppController
+        from gui import GUI
+
+        handler = DataHandler()
+        handler.load_file(csv_path, use_cache=False)
+        controller = AppController(handler)
+        gui = GUI(controller)
+        controller.set_gui(gui)
+
+        indicator = handler.get_indicators()[0]
+        years = handler.get_years_columns()
+        delta_df = handler.get_delta_df(indicator, years[0], years[-1])
+        country_col = handler.get_country_col()
+
+        # Redisplaying the same frame is a no-op: alternate two sort orders so
+        # that every repeat reorders all the rows
+        frames = itertools.cycle([delta_df, delta_df.iloc[::-1].reset_index(drop=True)])
+
+        def render():
+            gui.display_datas(country_col, next(frames))
+            gui.root.update_idletasks()
+
+        results = {'display_datas': measure(render, repeat)}
+        gui.root.destroy()
+        return results
+    finally:
+        if display is not None:
+            display.stop()
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> bool:
+    """Print each benchmark against the baseline. Returns False if any got slower than threshold."""
+    ok = True
+    for size, benchmarks in results['results'].items():
+        for name, current in benchmarks.items():
+            previous = baseline.get('results', {}).get(size, {}).get(name)
+            if previous is None:
+                print(f"{size:>8} {name:<22} {current['median_s']*1000:10.3f} ms   (no baseline)")
+                continue
+
+            ratio = current['median_s'] / max(previous['median_s'], 1e-12)
+            flag = ''
+            if ratio > 1 + threshold:
+                flag = '  REGRESSION'
+                ok = False
+            print(f"{size:>8} {name:<22} {current['median_s']*1000:10.3f} ms   x{ratio:5.2f} vs baseline{flag}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the load, query and render hot paths.")
+    parser.add_argument('--sizes', nargs='+', choices=sorted(SIZES), default=['small', 'medium'])
+    parser.add_argument('--repeat', type=int, default=5, help="timed runs per benchmark")
+    parser.add_argument('--gui', action='store_true', help="also benchmark Treeview rendering")
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'sat-benchmarks'),
+                        help="where generated datasets are kept between runs")
+    parser.add_argument('-o', '--output', default='bench_results.json', help="JSON file for the results")
+    parser.add_argument('--baseline', help="JSON results of a previous run to compare against")
+    parser.add_argument('--threshold', type=float, default=0.2, help="slowdown reported as a regression")
+    args = parser.parse_args()
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    results = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'cpu_count': os.cpu_count(),
+            'repeat': args.repeat,
+        },
+        'results': {},
+    }
+
+    for size in args.sizes:
+        countries, indicators, years = SIZES[size]
+        csv_path = os.path.join(args.data_dir, dataset_name(countries, indicators, years))
+        if not os.path.exists(csv_path):
+            print(f"Generating {csv_path}")
+            generate_dataset(csv_path, countries, indicators, years)
+
+        print(f"Running {size} benchmarks ({countries} countries x {indicators} indicators x {years} years)")
+        results['results'][size] = data_benchmarks(csv_path, args.repeat)
+        if args.gui:
+            results['results'][size].update(gui_benchmarks(csv_path, args.repeat))
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    if not compare(results, baseline, args.threshold):
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+import csv
+
+import numpy as np
+
+
+def country_names(count: int) -> list:
+    """Return count distinct country names."""
+    return [f"Country {i:06d}" for i in range(count)]
+
+
+def indicator_names(count: int) -> list:
+    """Return count distinct indicator names, as long as those of IMF exports."""
+    return [
+        f"Indicator {i:04d}, Constant prices, Per capita, purchasing power parity (PPP) international dollar"
+        for i in range(count)
+    ]
+
+
+def generate_dataset(path: str, countries: int, indicators: int, years: int,
+                     first_year: int = 1980, missing: float = 0.0, seed: int = 0):
+    """
+    Write a valid dataset in the COUNTRY, INDICATOR, <years...> layout.
+
+    Every (indicator, country) pair gets one row holding a positive random walk
+    over the years. A missing fraction of the values is left empty. Rows are
+    written one indicator at a time so memory stays bounded for large sizes.
+    """
+    if first_year < 1900 or first_year + years - 1 > 2099:
+        raise ValueError("Year columns must be between 1900 and 2099.")
+
+    rng = np.random.default_rng(seed)
+    names = country_names(countries)
+    year_columns = [str(first_year + i) for i in range(years)]
+
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['COUNTRY', 'INDICATOR'] + year_columns)
+
+        for indicator in indicator_names(indicators):
+            start = rng.uniform(10, 1000, size=(countries, 1))
+            growth = rng.normal(1.02, 0.05, size=(countries, years))
+            values = np.round(start * np.cumprod(growth, axis=1), 3)
+
+            if missing:
+                values[rng.random(values.shape) < missing] = np.nan
+
+            for country, row in zip(names, values):
+                writer.writerow([country, indicator] + ['' if np.isnan(v) else v for v in row])
+
+
+def dataset_name(countries: int, indicators: int, years: int) -> str:
+    return f"synthetic_{countries}c_{indicators}i_{years}y.csv"
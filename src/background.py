@@ -0,0 +1,87 @@
+import queue
+import threading
+
+
+class BackgroundTask:
+    """
+    Runs a function on a worker thread and reports back on the Tk thread.
+
+    The worker never touches Tk widgets: it pushes progress values and its
+    outcome onto a queue, which the Tk thread drains by polling with root.after.
+
+    Args:
+        root: Tk widget used to schedule the polling
+        target (callable): Called as target(progress, cancel_event) on the worker thread
+        on_done (callable): Called with the return value of target on the Tk thread
+        on_error (callable): Called with the exception raised by target on the Tk thread
+        on_progress (callable): Called with every value passed to progress, on the Tk thread
+        poll_ms (int): Milliseconds between two polls of the queue (default 50)
+
+    Attributes:
+        cancel_event (threading.Event): Set by cancel(); target should check it and stop
+        cancelled (bool): True once cancel() was called; no callback runs afterwards
+    """
+
+    def __init__(self, root, target, on_done, on_error, on_progress=None, poll_ms=50):
+        self.root = root
+        self.target = target
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.poll_ms = poll_ms
+
+        self.cancel_event = threading.Event()
+        self.cancelled = False
+
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+
+    def start(self):
+        """Start the worker thread and the polling loop."""
+        self._thread.start()
+        self.root.after(self.poll_ms, self._poll)
+
+
+    def cancel(self):
+        """Ask the worker to stop and discard whatever it still reports."""
+        self.cancelled = True
+        self.cancel_event.set()
+
+
+    def _run(self):
+        # Worker thread: only talks to the Tk thread through the queue
+        try:
+            result = self.target(self._report_progress, self.cancel_event)
+        except Exception as e:
+            self._queue.put(('error', e))
+        else:
+            self._queue.put(('done', result))
+
+
+    def _report_progress(self, value):
+        self._queue.put(('progress', value))
+
+
+    def _poll(self):
+        """Deliver queued messages on the Tk thread, then poll again until finished."""
+        if self.cancelled:
+            return
+
+        while True:
+            try:
+                kind, value = self._queue.get_nowait()
+            except queue.Empty:
+                break
+
+            if kind == 'progress':
+                if self.on_progress is not None:
+                    self.on_progress(value)
+            elif kind == 'done':
+                self.on_done(value)
+                return
+            else:
+                self.on_error(value)
+                return
+
+        self.root.after(self.poll_ms, self._poll)
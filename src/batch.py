@@ -0,0 +1,106 @@
+import fnmatch
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from data_handler import DataHandler
+from export import TableWriter, delta_table
+from sidecar_cache import SidecarCache
+
+# Data handler of the current process. Forked workers inherit the parent's one
+_handler = None
+
+
+def parse_year_range(text: str) -> tuple:
+    """Parse 'YYYY-YYYY' (or 'YYYY:YYYY') into a (start_year, end_year) pair of strings."""
+    parts = text.replace(':', '-').split('-')
+    if len(parts) != 2 or not all(part.strip().isdigit() for part in parts):
+        raise ValueError(f"Invalid year range: '{text}'. Expected START-END, e.g. 2017-2020.")
+
+    start_year, end_year = (part.strip() for part in parts)
+    if not int(start_year) < int(end_year):
+        raise ValueError(f"Invalid year range: '{text}'. The start year must be less than the end year.")
+    return start_year, end_year
+
+
+def select_indicators(indicators: list, patterns: list) -> list:
+    """Return the indicators matching any of the glob patterns (all of them if no pattern)."""
+    if not patterns:
+        return list(indicators)
+    return [indicator for indicator in indicators
+            if any(fnmatch.fnmatchcase(indicator, pattern) for pattern in patterns)]
+
+
+def run_batch(paths: list, output_path: str, indicator_patterns=None, year_ranges=None,
+              workers: int = None, use_cache: bool = True, conflict: str = 'last') -> int:
+    """
+    Compute the deltas of every selected indicator for every year range and
+    write them as one table to output_path (.csv, .parquet or .jsonl).
+    paths are CSV files, directories or prepared datasets, merged into one dataset.
+    Indicators are spread over a pool of worker processes.
+    Returns the number of rows written.
+    """
+    global _handler
+    _handler = DataHandler(sidecar_cache=SidecarCache() if use_cache else None)
+    _handler.load_files(paths, conflict)
+
+    years = _handler.get_years_columns()
+    year_ranges = year_ranges or [(years[0], years[-1])]
+    for start_year, end_year in year_ranges:
+        for year in (start_year, end_year):
+            if year not in years:
+                raise ValueError(f"Year must be between {years[0]} and {years[-1]}.")
+
+    indicators = select_indicators(_handler.get_indicators(), indicator_patterns)
+    if not indicators:
+        raise ValueError("No indicator matches the given patterns.")
+
+    workers = workers or os.cpu_count() or 1
+    # Written under a temporary name, as export does, so a failed run leaves no truncated file
+    partial_path = output_path + '.part' + os.path.splitext(output_path)[1]
+    writer = TableWriter(partial_path)
+    try:
+        try:
+            if workers == 1 or len(indicators) == 1:
+                for indicator in indicators:
+                    writer.write(_indicator_deltas(indicator, year_ranges))
+            else:
+                with ProcessPoolExecutor(
+                    max_workers=min(workers, len(indicators)),
+                    initializer=_init_worker,
+                    initargs=(paths, use_cache, conflict)
+                    ) as executor:
+                    # A few tasks per worker keeps them busy without much pickling overhead
+                    chunksize = max(1, len(indicators) // (workers * 4))
+                    tables = executor.map(
+                        _indicator_deltas,
+                        indicators,
+                        [year_ranges] * len(indicators),
+                        chunksize=chunksize
+                        )
+                    for table in tables:
+                        writer.write(table)
+        finally:
+            writer.close()
+        os.replace(partial_path, output_path)
+    except BaseException:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        raise
+
+    return writer.rows
+
+
+def _init_worker(paths: list, use_cache: bool, conflict: str):
+    """Load the dataset in a worker, unless it was inherited from the parent by fork."""
+    global _handler
+    if _handler is None:
+        _handler = DataHandler(sidecar_cache=SidecarCache() if use_cache else None)
+        _handler.load_files(paths, conflict)
+
+
+def _indicator_deltas(indicator: str, year_ranges: list) -> pd.DataFrame:
+    """Delta table of one indicator for every year range, in export.OUTPUT_COLUMNS layout."""
+    tables = [delta_table(_handler, indicator, start_year, end_year) for start_year, end_year in year_ranges]
+    return pd.concat(tables, ignore_index=True)
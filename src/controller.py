@@ -1,7 +1,24 @@
 import os
 import re
 
+from background import BackgroundTask
 from data_handler import DataHandler, InvalidFileFormatError
+from dataset_store import META_FILE
+from export import ExportCancelledError, export_all_indicators, export_table
+from file_watch import FileWatcher, read_file_state, rows_appended
+from instrumentation import traced
+from query import Query
+from recompute_scheduler import RecomputeScheduler
+from sorted_view import SortedView
+
+# Columns of a result table before its statistics columns. The year columns are
+# named after the selected years, so a column is identified by these names instead
+BASE_COLUMNS = ('country', 'start_year', 'end_year', 'delta')
+
+def _displayed_rows(controller, result):
+    """Row count recorded for a handler span: rows of the table left on display."""
+    return len(controller.current_df) if controller.current_df is not None else None
+
 
 class AppController:
     """
@@ -20,8 +37,23 @@ class AppController:
         gui (GUI): Reference to the GUI component (set later)
         directory (str): Current working directory for file dialogs
         current_df (pd.DataFrame): Currently displayed DataFrame in GUI
+        current_query (Query): Query of the displayed table, or None
+        latest_query (Query): Query last requested, displayed or still being computed
+        recompute (RecomputeScheduler): Coalesces table recomputations off the Tk thread
         min_year (int): Minimum year available in the data
         max_year (int): Maximum year available in the data
+        load_task (BackgroundTask): File load running on a worker thread, or None
+        export_task (BackgroundTask): Export running on a worker thread, or None
+        loaded_paths (list): Paths the current dataset was loaded from
+        loaded_state (FileState): State of the single loaded file the current dataset was read at, or None
+        file_watcher (FileWatcher): Watches the loaded file in watch mode, or None
+        reload_task (BackgroundTask): Reload of the watched file running on a worker thread, or None
+        pending_change (FileState): Change of the watched file put off by a load in progress, or None
+        statistics (list): Statistics shown as extra columns, names from indicator_stats.STATISTICS
+        correlation_recompute (RecomputeScheduler): Computes correlation matrices off the Tk thread
+        correlation_view (SortedView): Sort orders of the displayed correlation matrix
+        correlation_view_years (tuple): Year range of the displayed correlation matrix
+        correlation_years (tuple): Year range of the correlation matrix last requested
     """
     
     def __init__(self, data_handler: DataHandler):
@@ -30,50 +62,415 @@ class AppController:
         self.directory = os.getcwd()
 
         self.current_df = None
+        self.current_query = None
+        self.latest_query = None
+        self.recompute = None
         self.min_year = 0
         self.max_year = 0
 
+        self.load_task = None
+        self.export_task = None
+        self.loaded_paths = []
+        self.loaded_state = None
+        self.file_watcher = None
+        self.reload_task = None
+        self.pending_change = None
+        self.statistics = []
+        self.correlation_recompute = None
+        self.correlation_view = None
+        self.correlation_view_years = None
+        self.correlation_years = None
+
 
     def set_gui(self, gui):
         """Store reference to the GUI component for later interactions."""
         self.gui = gui
+        self.recompute = RecomputeScheduler(
+            gui.root,
+            lambda state: self.data_handler.run_query(*state),
+            on_result=self._on_query_done,
+            on_error=self._on_query_failed
+            )
+        self.correlation_recompute = RecomputeScheduler(
+            gui.root,
+            lambda state: self.data_handler.get_correlation_df(*state).reset_index(),
+            on_result=self._on_correlations_done,
+            on_error=self._on_correlations_failed
+            )
     
 
+    @traced(rows=_displayed_rows)
     def on_open_clicked(self):
         """
         Handles the "Open File" button click event.
-        Opens a file dialog, loads the selected CSV file, and updates the GUI
-        with the loaded data.
+        Opens a file dialog and loads the selected CSV files on a worker thread,
+        so the GUI stays responsive. The GUI is updated once loading finishes.
+        Several files are merged into one dataset.
+        Selecting the meta.json of a prepared dataset opens that dataset.
+        """
+        if self._progress_taken(self.export_task, "export"):
+            return
+
+        filenames = self.gui.show_file_dialog(self.directory)
+
+        if filenames:
+            self.directory = os.path.dirname(filenames[0])
+            paths = [
+                os.path.dirname(filename) if os.path.basename(filename) == META_FILE else filename
+                for filename in filenames
+                ]
+            self._start_load(paths)
 
-        Throw InvalidFileFormatError if the file format is incorrect.
+
+    @traced(rows=_displayed_rows)
+    def on_open_folder_clicked(self):
+        """
+        Handles the "Folder" button click event.
+        Loads every CSV file of the selected directory as one dataset.
         """
-        filename = self.gui.show_file_dialog(self.directory)
+        if self._progress_taken(self.export_task, "export"):
+            return
 
-        if filename:
-            self.directory = os.path.dirname(filename)
-            self.gui.display_path_file(filename)
-            
-            try:
-                self.data_handler.load_file(filename) 
-            except InvalidFileFormatError as e:
-                self.current_df = None
-                self.gui.show_error(str(e))
-                return
+        directory = self.gui.show_folder_dialog(self.directory)
+
+        if directory:
+            self.directory = directory
+            self._start_load([directory])
+
+
+    @traced(rows=_displayed_rows)
+    def on_cancel_clicked(self):
+        """
+        Handles the "Cancel" button click event.
+        Stops the file load or the export in progress; only one of them runs
+        at a time. A cancelled load leaves the previous dataset displayed and
+        a cancelled export writes no file.
+        """
+        if self.load_task is not None:
+            self.load_task.cancel()
+            self.load_task = None
+            self._reload_pending_change()
+        if self.export_task is not None:
+            self.export_task.cancel()
+            self.export_task = None
+
+        self.gui.hide_progress()
+
+
+    def _start_load(self, paths: list):
+        """Start loading paths in the background, replacing any load in progress."""
+        if self.load_task is not None:
+            self.load_task.cancel()
+        # A reload finishing before the load would swap its dataset in under it;
+        # the change is reloaded again if the load fails or is cancelled
+        if self.reload_task is not None:
+            self.reload_task.cancel()
+            self.reload_task = None
+            self.pending_change = self.file_watcher.state
+        # Results computed on the previous dataset must not be displayed; a query
+        # dropped here is requested again if the load fails or is cancelled
+        self.recompute.cancel()
+        self.latest_query = self.current_query
+
+        self.gui.show_progress()
+        self.load_task = BackgroundTask(
+            self.gui.root,
+            lambda progress, cancel_event: self._load_worker(paths, progress, cancel_event),
+            on_done=self._on_load_done,
+            on_error=self._on_load_failed,
+            on_progress=self.gui.update_progress
+            )
+        self.load_task.start()
 
-            self.min_year, self.max_year = self._min_max_years_boundary()
-            
-            self.gui.display_years(self.min_year, self.max_year)       
-            self.gui.display_indicators(self.data_handler.get_indicators())
-            
-            # Display delta data for full year range with default indicator
-            self.current_df = self.data_handler.get_delta_df(
-                self.gui.indicators_cb.get(), 
-                str(self.min_year), 
-                str(self.max_year)
+
+    @traced(rows=lambda controller, result: len(result[2]))
+    def _load_worker(self, paths: list, progress, cancel_event):
+        """
+        Runs on the worker thread: reads the file into a new dataset and computes
+        the default view. Nothing visible to the Tk thread is modified here.
+        The state of a single file is taken first, so any later change to it is seen.
+        """
+        state = read_file_state(paths[0]) if len(paths) == 1 and os.path.isfile(paths[0]) else None
+        dataset = self.data_handler.read_paths(paths, progress=progress, cancel_event=cancel_event)
+
+        indicators = dataset.get_indicators()
+        if not indicators:
+            raise InvalidFileFormatError("The file does not contain any data.")
+
+        # Delta data for full year range with default indicator
+        years_columns = dataset.get_years_columns()
+        first_query = Query(indicators[0], years_columns[0], years_columns[-1], statistics=tuple(self.statistics))
+        first_df = self.data_handler.run_query(first_query, dataset=dataset)
+        return paths, state, dataset, indicators, first_query, first_df
+
+
+    @traced(rows=_displayed_rows)
+    def _on_load_done(self, result):
+        """
+        Swap in the newly loaded dataset and display it. The previous file is
+        watched until then, so a failed or cancelled load leaves it watched.
+        """
+        paths, state, dataset, indicators, first_query, first_df = result
+        self.load_task = None
+        self.gui.hide_progress()
+        self._stop_watching()
+
+        self.data_handler.set_dataset(dataset)
+        self.gui.display_path_file("; ".join(paths))
+        self.loaded_paths = paths
+        self.loaded_state = state
+
+        self.min_year, self.max_year = self._min_max_years_boundary()
+        
+        self.gui.display_years(self.min_year, self.max_year)       
+        self.gui.display_indicators(indicators)
+        
+        self.recompute.cancel()
+        self.current_query, self.current_df = first_query, first_df
+        self.latest_query = first_query
+        self.gui.display_datas(self.data_handler.get_country_col(), self.current_df)
+
+        if self.gui.correlations_shown():
+            self._show_correlations(str(self.min_year), str(self.max_year))
+
+        if self.gui.watch_enabled():
+            self._start_watching()
+
+
+    @traced()
+    def on_watch_toggled(self):
+        """
+        Handles the "Watch" check box.
+        While checked, the loaded file is reloaded whenever it changes on disk.
+        """
+        if self.gui.watch_enabled():
+            self._start_watching()
+        else:
+            self._stop_watching()
+
+
+    def _start_watching(self):
+        """Watch the loaded file. Only a single CSV file can be watched."""
+        self._stop_watching()
+        if self.current_df is None:
+            return
+
+        if self.loaded_state is None or not os.path.isfile(self.loaded_paths[0]):
+            self.gui.set_watch_enabled(False)
+            self.gui.show_error("Only a single CSV file can be watched.")
+            return
+
+        # Changes are reported from the state the displayed dataset was read at
+        self.file_watcher = FileWatcher(
+            self.gui.root, self.loaded_paths[0], self._on_file_changed, state=self.loaded_state
+            )
+        self.file_watcher.start()
+
+
+    def _stop_watching(self):
+        if self.file_watcher is not None:
+            self.file_watcher.stop()
+            self.file_watcher = None
+        if self.reload_task is not None:
+            self.reload_task.cancel()
+            self.reload_task = None
+        self.pending_change = None
+
+
+    def _on_file_changed(self, state):
+        """
+        Reload the watched file on a worker thread; the displayed data stays usable meanwhile.
+        A reload still running is superseded: the new one starts again from the
+        displayed dataset and the file state it was read at. During a load the
+        change is only recorded, to be reloaded if the load fails or is cancelled.
+        """
+        if self.load_task is not None:
+            self.pending_change = state
+            return
+
+        if self.reload_task is not None:
+            self.reload_task.cancel()
+
+        path = self.file_watcher.path
+        dataset, loaded_state = self.data_handler.dataset, self.loaded_state
+        self.reload_task = BackgroundTask(
+            self.gui.root,
+            lambda progress, cancel_event: self._reload_worker(path, dataset, loaded_state, state, cancel_event),
+            on_done=lambda reloaded: self._on_reload_done(state, reloaded),
+            on_error=self._on_reload_failed
+            )
+        self.reload_task.start()
+
+
+    @traced(rows=lambda controller, result: len(result))
+    def _reload_worker(self, path: str, dataset, old_state, new_state, cancel_event):
+        """
+        Runs on the worker thread: when rows were only appended to the file
+        since old_state, the state dataset was read at, reads just those rows
+        into a copy of dataset, otherwise reads the whole file again.
+        """
+        if rows_appended(path, old_state, new_state):
+            return self.data_handler.read_appended(
+                path, dataset, old_state.size, new_state.size, cancel_event=cancel_event
+                )
+        return self.data_handler.read_dataset(path, cancel_event=cancel_event)
+
+
+    @traced(rows=_displayed_rows)
+    def _on_reload_done(self, state, dataset):
+        """
+        Swap in the dataset reloaded from the file at state, keeping the indicator,
+        year range, country filter, statistics and sort of the displayed table
+        where they still apply.
+        """
+        self.reload_task = None
+        indicators = dataset.get_indicators()
+        if not indicators:
+            self.gui.show_error("The watched file does not contain any data anymore.")
+            return
+
+        # The dataset is an immutable snapshot: swapping the reference is atomic
+        self.data_handler.set_dataset(dataset)
+        self.loaded_state = state
+        self.min_year, self.max_year = self._min_max_years_boundary()
+
+        query = self.latest_query
+        start_year = min(max(int(query.start_year), self.min_year), self.max_year)
+        end_year = min(max(int(query.end_year), self.min_year), self.max_year)
+        if not start_year < end_year:
+            start_year, end_year = self.min_year, self.max_year
+
+        self.gui.update_indicators(indicators)
+        self.gui.update_year_bounds(self.min_year, self.max_year, start_year, end_year)
+        query = query._replace(
+            indicator=query.indicator if query.indicator in indicators else indicators[0],
+            start_year=str(start_year),
+            end_year=str(end_year)
+            )
+
+        # Same query, new data: it must be computed again, and so must an open correlation matrix
+        self.latest_query = None
+        if self.gui.correlations_shown():
+            self._show_correlations(query.start_year, query.end_year)
+        self._run_query(query)
+
+
+    def _on_reload_failed(self, error: Exception):
+        """Report a failed reload. The current dataset stays displayed and watched."""
+        self.reload_task = None
+        self.gui.show_error(f"The watched file could not be reloaded: {error}")
+
+
+    def _reload_pending_change(self):
+        """Reload the watched file if it changed during a load that failed or was cancelled."""
+        state, self.pending_change = self.pending_change, None
+        if state is not None and self.file_watcher is not None:
+            self._on_file_changed(state)
+
+
+    def _on_load_failed(self, error: Exception):
+        """Report a failed load. The previous dataset is left untouched, and still watched."""
+        self.load_task = None
+        self.gui.hide_progress()
+        self._reload_pending_change()
+
+        if isinstance(error, InvalidFileFormatError):
+            self.gui.show_error(str(error))
+        else:
+            self.gui.show_error(f"The file could not be loaded: {error}")
+
+
+    @traced()
+    def on_export_view_clicked(self):
+        """
+        Handles the "Export > Displayed table" menu event.
+        Writes the displayed table, in its current order, to the chosen file.
+        """
+        if self.current_df is None or self._progress_taken(self.load_task, "file load"):
+            return
+
+        path = self.gui.show_export_dialog(self.directory)
+        if path:
+            view_df = self.current_df
+            self._start_export(
+                path,
+                lambda progress, cancel_event: export_table(view_df, path, progress, cancel_event)
                 )
-            self.gui.display_datas(self.data_handler.get_country_col(), self.current_df)
 
 
+    @traced()
+    def on_export_all_clicked(self):
+        """
+        Handles the "Export > All indicators" menu event.
+        Writes the deltas of every indicator over the selected years to the chosen file.
+        """
+        if self.current_df is None or self._progress_taken(self.load_task, "file load"):
+            return
+
+        try:
+            _, start_year, end_year = self._get_valid_user_values()
+        except ValueError as e:
+            self.gui.show_error(str(e))
+            return
+
+        path = self.gui.show_export_dialog(self.directory)
+        if path:
+            dataset = self.data_handler.dataset
+            self._start_export(
+                path,
+                lambda progress, cancel_event: export_all_indicators(
+                    self.data_handler, start_year, end_year, path, dataset, progress, cancel_event
+                    )
+                )
+
+
+    def _progress_taken(self, task: BackgroundTask, name: str) -> bool:
+        """
+        Loads and exports share the progress bar and Cancel button, so only one
+        of them runs at a time. Returns whether task, the one already using
+        them, is still running, in which case the user is asked to wait.
+        """
+        if task is None:
+            return False
+
+        self.gui.show_error(f"Please wait for the {name} to finish, or cancel it.")
+        return True
+
+
+    def _start_export(self, path: str, target):
+        """Run an export on a worker thread, with the progress bar and Cancel button shown."""
+        if self.export_task is not None:
+            self.export_task.cancel()
+
+        self.directory = os.path.dirname(path)
+        self.gui.show_progress()
+        self.export_task = BackgroundTask(
+            self.gui.root,
+            target,
+            on_done=lambda rows: self._on_export_done(path, rows),
+            on_error=self._on_export_failed,
+            on_progress=self.gui.update_progress
+            )
+        self.export_task.start()
+
+
+    def _on_export_done(self, path: str, rows: int):
+        """Report a finished export."""
+        self.export_task = None
+        self.gui.hide_progress()
+        self.gui.show_info(f"{rows:,} rows exported to {path}")
+
+
+    def _on_export_failed(self, error: Exception):
+        """Report a failed export. A partial file is never left behind."""
+        self.export_task = None
+        self.gui.hide_progress()
+
+        if not isinstance(error, ExportCancelledError):
+            self.gui.show_error(f"The export failed: {error}")
+
+
+    @traced(rows=_displayed_rows)
     def on_indicator_selected(self, event=None):
          """
          Handles the event when an indicator is selected from the dropdown.
@@ -85,39 +482,32 @@ class AppController:
          self.on_inputs_changed()
 
 
+    @traced(rows=_displayed_rows)
     def on_inputs_changed(self):
         """
         Handles changes in user inputs (indicator, start year, end year).
-        Updates the displayed data accordingly.
+        Updates the displayed data accordingly. Changes arriving in quick
+        succession, like a held spinbox arrow, are merged into one recomputation.
         """
         if self.current_df is None:
                 return   
 
         try:
-            indicator, start_year, end_year = self._get_user_values()
-            if not (int(start_year) < int(end_year)):
-                raise ValueError(f"Invalid year range: the start year must be less than the end year.")
-            if not self._validate_years_input_user(start_year, end_year):
-                raise ValueError(f"Year must be between {self.min_year} and {self.max_year}. ")
+            query = self._build_query()
         except ValueError as e:
             self.gui.show_error(str(e))
             return
-        
-        # Recalculate delta data based on new indicator and year inputs
-        self.current_df = self.data_handler.get_delta_df(indicator, start_year, end_year)
 
-        # Apply country filter if user has selected specific countries
-        if self.gui.get_selected_countries():
-            self.current_df = self._filter(self.current_df)
-        
-        self.gui.display_datas(self.data_handler.get_country_col(), self.current_df)
+        # Recalculate delta data based on new indicator and year inputs,
+        # for the selected countries only
+        self._run_query(query, delay_ms=self.recompute.delay_ms)
 
 
+    @traced(rows=_displayed_rows)
     def on_filter_clicked(self):
         """
         Handles the "Filter" button click event.
-        Filters the current DataFrame based on selected countries
-        and updates the GUI display.
+        Shows only the selected countries and updates the GUI display.
         """
         if self.current_df is None:
             return
@@ -125,10 +515,15 @@ class AppController:
         self.gui.clear_searchbar()
 
         if self.gui.get_selected_countries():
-            self.current_df = self._filter(self.current_df) 
-            self.gui.display_datas(self.data_handler.get_country_col(), self.current_df)
+            try:
+                query = self._build_query()
+            except ValueError as e:
+                self.gui.show_error(str(e))
+                return
+            self._run_query(query)
 
 
+    @traced(rows=_displayed_rows)
     def on_clear_clicked(self):
         """
         Handles the "Clear" button click event.
@@ -137,30 +532,192 @@ class AppController:
         if self.current_df is None:
             return
         
-        # Recalculate delta without any country filtering
-        self.current_df = self.data_handler.get_delta_df(
-            self.gui.indicators_cb.get(), 
-            str(self.min_year), 
-            str(self.max_year)
-            )
-        
         self.gui.clear_searchbar()
         self.gui.clear_selection()
-        self.gui.display_datas(self.data_handler.get_country_col(), self.current_df)
         self.gui.display_years(self.min_year, self.max_year)
 
+        # Recalculate delta without any country filtering, keeping the sort
+        self._run_query(self.latest_query._replace(
+            indicator=self.gui.indicators_cb.get(),
+            start_year=str(self.min_year),
+            end_year=str(self.max_year),
+            countries=frozenset()
+            ))
+
 
+    @traced(rows=_displayed_rows)
     def on_heading_clicked(self, icol: int):
         """
         Handles the event when a column heading is clicked.
         Sorts the current DataFrame based on the clicked column and updates the GUI display.
+        If the same column is clicked again, it reverses the sort order.
         """
         if self.current_df is None:
             return
-        
-        self.current_df = self.data_handler.toggle_sort(icol, self.current_df)
+
+        # Sort orders are cached with the query's table: sorting does not compute again
+        query = self.latest_query
+        ascending = not query.ascending if query.sort_col == icol else True
+        self._run_query(query._replace(sort_col=icol, ascending=ascending))
+
+
+    @traced(rows=_displayed_rows)
+    def on_statistics_changed(self):
+        """
+        Handles a change of the statistics columns picked in the "Columns" menu.
+        Recomputes the displayed table with the new columns.
+        """
+        self.statistics = self.gui.get_selected_statistics()
+        self.on_inputs_changed()
+
+
+    @traced()
+    def on_correlation_clicked(self):
+        """
+        Handles the "Correlations" button click event.
+        Opens the correlation matrix of all indicators over the selected years.
+        """
+        if self.current_df is None:
+            return
+
+        try:
+            _, start_year, end_year = self._get_valid_user_values()
+        except ValueError as e:
+            self.gui.show_error(str(e))
+            return
+
+        self._show_correlations(start_year, end_year)
+
+
+    @traced()
+    def on_correlation_mode_changed(self):
+        """
+        Handles a change of correlation mode: recomputes the matrix for the same
+        years, or for the selected years when no matrix was requested or shown.
+        """
+        years = self.correlation_years or self.correlation_view_years
+        if years is None:
+            try:
+                _, *years = self._get_valid_user_values()
+            except ValueError as e:
+                self.gui.show_error(str(e))
+                return
+
+        self._show_correlations(*years)
+
+
+    @traced()
+    def on_correlation_heading_clicked(self, icol: int):
+        """
+        Handles a click on a column heading of the correlation matrix.
+        Sorts the indicators by that column, reversing the order on a second click.
+        """
+        self.gui.show_correlations(self.correlation_view.toggle(icol), *self.correlation_view_years)
+
+
+    @traced()
+    def on_correlation_closed(self):
+        """Handles the closing of the correlation window: a matrix still being computed is dropped."""
+        self.correlation_recompute.cancel()
+        self.correlation_years = None
+
+
+    def _show_correlations(self, start_year: str, end_year: str):
+        """
+        Compute (or fetch from the cache) the correlation matrix on a worker
+        thread and display it once ready, opening its window if needed.
+        """
+        mode = self.gui.get_correlation_mode() if self.gui.correlations_shown() else 'delta'
+
+        self.correlation_years = (start_year, end_year)
+        self.correlation_recompute.request((start_year, end_year, mode, self.data_handler.dataset), delay_ms=0)
+
+
+    @traced()
+    def _on_correlations_done(self, state, correlation_df):
+        """Display the correlation matrix last requested."""
+        start_year, end_year, _, _ = state
+        self.correlation_view = SortedView(correlation_df)
+        self.correlation_view_years = (start_year, end_year)
+        self.gui.show_correlations(correlation_df, start_year, end_year)
+
+
+    def _on_correlations_failed(self, error: Exception):
+        """Report a failed correlation matrix; the displayed one stays as it was."""
+        self.correlation_years = self.correlation_view_years
+        self.gui.show_error(str(error))
+
+
+    def _on_query_failed(self, error: Exception):
+        """Report a failed query; the displayed table stays as it was."""
+        self.latest_query = self.current_query
+        self.gui.show_error(str(error))
+
+
+    def _build_query(self) -> Query:
+        """
+        Build the query of the table described by the GUI state: indicator,
+        year range, selected countries and statistics columns. The sort of the
+        displayed table follows its column to wherever the statistics columns
+        put it, and is dropped when that column is removed.
+        Raises ValueError if the years are invalid.
+        """
+        indicator, start_year, end_year = self._get_valid_user_values()
+
+        sort_col, ascending = None, True
+        latest = self.latest_query
+        if latest is not None and latest.sort_col is not None:
+            sorted_column = (*BASE_COLUMNS, *latest.statistics)[latest.sort_col]
+            columns = (*BASE_COLUMNS, *self.statistics)
+            if sorted_column in columns:
+                sort_col, ascending = columns.index(sorted_column), latest.ascending
+
+        return Query(
+            indicator,
+            start_year,
+            end_year,
+            countries=frozenset(self.gui.get_selected_countries()),
+            statistics=tuple(self.statistics),
+            sort_col=sort_col,
+            ascending=ascending
+            )
+
+
+    def _run_query(self, query: Query, delay_ms: int = 0):
+        """
+        Compute query on a worker thread and display its result, unless it is
+        the query last requested. Waits delay_ms for further requests first;
+        the result of a query superseded meanwhile is never displayed.
+        """
+        if query == self.latest_query:
+            return
+
+        self.latest_query = query
+        self.recompute.request((query, self.data_handler.dataset), delay_ms)
+
+
+    @traced(rows=_displayed_rows)
+    def _on_query_done(self, state, result_df):
+        """Display the table of the latest query."""
+        self.current_query, _ = state
+        self.current_df = result_df
         self.gui.display_datas(self.data_handler.get_country_col(), self.current_df)
 
+        # An open correlation matrix follows the year range
+        years = (self.current_query.start_year, self.current_query.end_year)
+        if self.gui.correlations_shown() and years != self.correlation_years:
+            self._show_correlations(*years)
+
+
+    def _get_valid_user_values(self):
+        """Return the user's indicator and year range. Raises ValueError if the years are invalid."""
+        indicator, start_year, end_year = self._get_user_values()
+        if not (int(start_year) < int(end_year)):
+            raise ValueError(f"Invalid year range: the start year must be less than the end year.")
+        if not self._validate_years_input_user(start_year, end_year):
+            raise ValueError(f"Year must be between {self.min_year} and {self.max_year}. ")
+        return indicator, start_year, end_year
+
 
     def _get_user_values(self):
         """Retrieve current indicator and year range selections from GUI."""
@@ -192,16 +749,3 @@ class AppController:
                         
         else:
             return False
-
-
-    def _filter(self, df):
-        """Filter DataFrame to include only selected countries."""
-        selected_countries = self.gui.get_selected_countries()
-        country_col = self.data_handler.get_country_col()
-        
-        # Filter DataFrame to only include rows with selected countries
-        return df[df[country_col].isin(selected_countries)]
-        
-
-
-
@@ -0,0 +1,77 @@
+import numpy as np
+
+from indicator_stats import percent_change
+
+# What is correlated: the % change over the whole range of each country,
+# or every year-over-year % change of each country
+CORRELATION_MODES = ('delta', 'yoy')
+
+# Pairs with fewer common observations than this get no correlation
+MIN_OBSERVATIONS = 3
+
+# A variance below this fraction of the sum of squares it is taken from is rounding error
+VARIANCE_TOLERANCE = 64 * np.finfo(float).eps
+
+
+def indicator_observations(dataset, start_pos: int, end_pos: int, mode: str = 'delta') -> np.ndarray:
+    """
+    Return the observations of every indicator of dataset between the year
+    positions start_pos and end_pos, as a matrix with one column per indicator
+    code and NaN where a country has no value.
+    - 'delta': one row per country, the % change from start to end year
+    - 'yoy': one row per (country, year), the % change from the previous year
+    All indicators are computed at once from the row block of the dataset.
+    """
+    if mode not in CORRELATION_MODES:
+        raise ValueError(f"Unknown correlation mode: '{mode}'. Use one of {', '.join(CORRELATION_MODES)}.")
+
+    indicator_codes = dataset.row_indicator_codes()
+    shape = (len(dataset.countries), len(dataset.indicators))
+
+    if mode == 'delta':
+        observations = np.full(shape, np.nan)
+        observations[dataset.country_codes, indicator_codes] = percent_change(
+            np.asarray(dataset.values[:, start_pos], dtype=float),
+            np.asarray(dataset.values[:, end_pos], dtype=float)
+            )
+        return observations
+
+    block = np.asarray(dataset.values[:, start_pos:end_pos + 1], dtype=float)
+    changes = percent_change(block[:, :-1], block[:, 1:])
+    observations = np.full((shape[0], changes.shape[1], shape[1]), np.nan)
+    observations[dataset.country_codes, :, indicator_codes] = changes
+    return observations.reshape(-1, shape[1])
+
+
+def correlation_matrix(observations: np.ndarray) -> np.ndarray:
+    """
+    Pearson correlation of every pair of columns of observations, each pair
+    using only the rows where both columns have a value (pairwise complete).
+
+    All pairs come out of a few matrix products over the presence mask and the
+    zero-filled values, so hundreds of columns take one batched pass instead
+    of one pass per pair. NaN where a pair has fewer than MIN_OBSERVATIONS
+    common rows or no variance.
+    """
+    present = ~np.isnan(observations)
+    mask = present.astype(float)
+
+    # Centering each column first keeps the sums small, limiting cancellation
+    with np.errstate(divide='ignore', invalid='ignore'):
+        means = np.where(present, observations, 0).sum(axis=0) / present.sum(axis=0)
+    values = np.where(present, observations - np.nan_to_num(means), 0)
+
+    # Entry (i, j): over the rows where both i and j are present
+    counts = mask.T @ mask
+    sums = values.T @ mask
+    squares = (values ** 2).T @ mask
+    products = values.T @ values
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        covariance = products - sums * sums.T / counts
+        variance = squares - sums ** 2 / counts
+        correlation = covariance / np.sqrt(variance * variance.T)
+
+    noise = VARIANCE_TOLERANCE * squares
+    valid = (counts >= MIN_OBSERVATIONS) & (variance > noise) & (variance.T > noise.T)
+    return np.clip(np.where(valid, correlation, np.nan), -1, 1)
@@ -0,0 +1,132 @@
+import tkinter as tk
+from tkinter import ttk
+
+
+class CorrelationWindow:
+    """
+    Separate window showing the correlation matrix of all indicators.
+
+    Responsible for:
+    - Choosing what is correlated: deltas over the range or year-over-year changes
+    - Rendering the matrix in a Treeview, one row and one column per indicator
+    - Forwarding heading clicks to the controller, which sorts the rows
+
+    Args:
+        root (tk.Tk): Main window of the application
+        controller (AppController): Controller handling the window's events
+
+    Attributes:
+        window (tk.Toplevel): The window, or None once closed
+        mode_var (tk.StringVar): Selected correlation mode ('delta' or 'yoy')
+        treeview (ttk.Treeview): Matrix table
+    """
+
+    def __init__(self, root, controller):
+        self.controller = controller
+        self.label_width = 260
+        self.cell_width = 90
+        # Longer indicator names are cut in the column headings
+        self.heading_length = 14
+        self.column_names = []
+
+        self.window = tk.Toplevel(root)
+        self.window.title("Indicator correlations")
+        self.window.geometry("800x500")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        self._build_header()
+        self._build_treeview()
+
+
+    def _build_header(self):
+        """Build the year range label and the correlation mode selector."""
+        header = tk.Frame(self.window)
+        header.pack(padx=10, pady=10, anchor='nw')
+
+        self.range_var = tk.StringVar()
+        tk.Label(header, textvariable=self.range_var).pack(side='left', padx=(0, 20))
+
+        self.mode_var = tk.StringVar(value='delta')
+        for text, mode in (("% change over the range", 'delta'), ("Year-over-year changes", 'yoy')):
+            ttk.Radiobutton(
+                header,
+                text=text,
+                value=mode,
+                variable=self.mode_var,
+                command=self.controller.on_correlation_mode_changed
+                ).pack(side='left', padx=5)
+
+
+    def _build_treeview(self):
+        """Build the matrix table with both scrollbars."""
+        frame = tk.Frame(self.window)
+        frame.pack(padx=10, pady=(0, 10), fill='both', expand=True)
+
+        y_scroll = tk.Scrollbar(frame)
+        y_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        x_scroll = tk.Scrollbar(frame, orient='horizontal')
+        x_scroll.pack(side=tk.BOTTOM, fill=tk.X)
+
+        self.treeview = ttk.Treeview(
+            frame,
+            yscrollcommand=y_scroll.set,
+            xscrollcommand=x_scroll.set,
+            show='headings'
+            )
+        self.treeview.pack(fill='both', expand=True, side=tk.LEFT)
+        y_scroll.config(command=self.treeview.yview)
+        x_scroll.config(command=self.treeview.xview)
+
+
+    def display(self, df, start_year, end_year):
+        """
+        Show the matrix df: first column the indicator names, then one
+        correlation column per indicator. Indicators are numbered in column
+        order, so cut headings can be matched with the full names of the rows.
+        """
+        numbers = {name: i for i, name in enumerate(df.columns[1:], 1)}
+
+        self.range_var.set(f"From {start_year} to {end_year}")
+        self.treeview.delete(*self.treeview.get_children())
+
+        columns = [str(i) for i in range(df.shape[1])]
+        if list(df.columns) != self.column_names:
+            self.column_names = list(df.columns)
+            self.treeview['columns'] = columns
+            for i, col in enumerate(df.columns):
+                self.treeview.heading(
+                    columns[i],
+                    text=col if i == 0 else self._heading(i, col),
+                    command=lambda i=i: self.controller.on_correlation_heading_clicked(i)
+                    )
+                self.treeview.column(columns[i], anchor='e', width=self.cell_width, stretch=False)
+            self.treeview.column(columns[0], anchor='w', width=self.label_width, stretch=False)
+
+        for row in df.itertuples(index=False):
+            values = [f"{numbers[row[0]]}. {row[0]}"] + ["" if value != value else f"{value:.3f}" for value in row[1:]]
+            self.treeview.insert('', 'end', values=values)
+
+
+    def _heading(self, number: int, name: str) -> str:
+        """Column heading of the number-th indicator: its number and the start of its name."""
+        heading = f"{number}. {name}"
+        if len(heading) <= self.heading_length:
+            return heading
+        return heading[:self.heading_length - 1] + "…"
+
+
+    def get_mode(self) -> str:
+        """Return the selected correlation mode."""
+        return self.mode_var.get()
+
+
+    def is_open(self) -> bool:
+        """Return whether the window is still shown."""
+        return self.window is not None
+
+
+    def close(self):
+        """Destroy the window and tell the controller."""
+        self.window.destroy()
+        self.window = None
+        self.controller.on_correlation_closed()
@@ -1,9 +1,47 @@
+import glob
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
 import pandas as pd
 import numpy as np
-import re
+
+from correlation import correlation_matrix, indicator_observations
+from dataset import Dataset, MergeConflictError, append_rows, merge_datasets
+from dataset_store import is_prepared_dataset, load_dataset, save_dataset
+from indicator_stats import compute_statistics
+from instrumentation import traced
+from query import Query
+from range_tables import RangeTables
+from result_cache import ResultCache
+from sidecar_cache import SidecarCache
+from sorted_view import SortedView
+from validation import ChunkValidator, validate_header
+
+# Number of CSV rows parsed at a time when loading a file
+DEFAULT_CHUNKSIZE = 100_000
+
 
 class InvalidFileFormatError(Exception):
-   """Exception raised when CSV file is not the right format"""
+   """
+   Exception raised when CSV file is not the right format.
+   issues holds every ValidationIssue found, so all of them can be fixed at once.
+   """
+
+   def __init__(self, message: str = None, issues: list = ()):
+      self.issues = list(issues)
+      if message is None:
+         if len(self.issues) == 1:
+            message = self.issues[0].message
+         else:
+            message = f"The file has {len(self.issues)} problems:\n" + "\n".join(
+               f"- {issue.message}" for issue in self.issues
+               )
+      super().__init__(message)
+
+
+class LoadCancelledError(Exception):
+   """Exception raised when a file load is cancelled before it completes"""
    pass
 
 
@@ -12,105 +50,525 @@ class DataHandler:
    Model layer of the application (MVC pattern).
 
    Responsible for:
-   - Loading and validating CSV data files
+   - Loading and validating CSV data files into immutable Dataset snapshots
    - Calculating deltas for indicators over specified years by country
    - Providing data to the controller for GUI display
+   - Caching delta results of recent queries until a new file is loaded
+   - Reusing validated binary sidecars of previously loaded files
+   - Opening prepared on-disk datasets through memory mapping
+   - Merging several files, parsed in parallel, into one dataset
+
+   Args:
+         cache_size (int): Maximum number of delta results kept in the LRU cache
+         sidecar_cache (SidecarCache): On-disk cache of loaded files (None disables it)
 
    Attributes:
-         df (pd.DataFrame): Loaded data frame from the CSV file
-         toggle (int): Toggle state for sorting (0: ascending, 1: descending)
-         icol_prec (int): Previously clicked column index for sorting
+         dataset (Dataset): Currently loaded dataset snapshot, or None
+         cache (ResultCache): LRU cache of delta and statistics results keyed by dataset and query
+         sidecar_cache (SidecarCache): On-disk cache of loaded files, or None
          country_col (str): Expected name of the country column in the CSV
          indicator_col (str): Expected name of the indicator column in the CSV
    """
    
-   def __init__(self):
-      self.df = None
+   def __init__(self, cache_size: int = 128, sidecar_cache: SidecarCache = None):
+      self.dataset = None
 
-      self.toggle=0
-      self.icol_prec=-1
+      self.cache = ResultCache(cache_size)
+      self.sidecar_cache = sidecar_cache
 
       self.country_col = 'COUNTRY'
       self.indicator_col = 'INDICATOR'
 
 
-   def load_file(self, csv_path: str):
+   @traced()
+   def load_file(self, csv_path: str, chunksize: int = DEFAULT_CHUNKSIZE, use_cache: bool = True):
+      """
+      Loads and validates the CSV file at the given path and makes it the current dataset.
+      Raises InvalidFileFormatError if the file format is incorrect, in which
+      case the previously loaded dataset is kept.
+      """
+      self.set_dataset(self.read_dataset(csv_path, chunksize, use_cache))
+
+
+   def set_dataset(self, dataset: Dataset):
+      """Makes dataset the current one. Cached results of the previous dataset are dropped."""
+      self.dataset = dataset
+      self.cache.clear()
+
+
+   def load_files(self, paths: list, conflict: str = 'last'):
+      """
+      Loads several CSV files, directories or prepared datasets as one dataset
+      and makes it the current one. See read_paths.
+      """
+      self.set_dataset(self.read_paths(paths, conflict=conflict))
+
+
+   @traced()
+   def read_paths(self, paths: list, conflict: str = 'last', chunksize: int = DEFAULT_CHUNKSIZE,
+                  use_cache: bool = True, max_workers: int = None,
+                  progress=None, cancel_event=None) -> Dataset:
+      """
+      Reads CSV files, directories of CSV files and prepared datasets into one Dataset.
+      Files are parsed and validated in parallel on a process pool, then merged:
+      year ranges, countries and indicators are combined, and a cell found in
+      several files is resolved by conflict ('last' file wins, 'first' file wins,
+      or 'error'). See merge_datasets.
+
+      progress (callable): Called with the fraction of files read
+      cancel_event (threading.Event): When set, the load stops with LoadCancelledError
+
+      Raises InvalidFileFormatError naming the file if any file is invalid.
+      """
+      paths = self._expand_paths(paths)
+      if not paths:
+         raise InvalidFileFormatError("No CSV file was found.")
+      if len(paths) == 1:
+         return self.read_dataset(paths[0], chunksize, use_cache, progress, cancel_event)
+
+      datasets = [None] * len(paths)
+      workers = min(max_workers or os.cpu_count() or 1, len(paths))
+      with ProcessPoolExecutor(max_workers=workers) as executor:
+         futures = {
+            executor.submit(_read_dataset_in_worker, self.sidecar_cache, path, chunksize, use_cache): i
+            for i, path in enumerate(paths)
+         }
+         try:
+            for done, future in enumerate(as_completed(futures), start=1):
+               i = futures[future]
+               try:
+                  datasets[i] = future.result()
+               except InvalidFileFormatError as e:
+                  raise InvalidFileFormatError(f"{os.path.basename(paths[i])}: {e}", e.issues)
+
+               if progress is not None:
+                  progress(done / len(paths))
+               if cancel_event is not None and cancel_event.is_set():
+                  raise LoadCancelledError("The file load was cancelled.")
+         except BaseException:
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+
+      try:
+         return merge_datasets(datasets, conflict)
+      except MergeConflictError as e:
+         raise InvalidFileFormatError(str(e))
+
+
+   @staticmethod
+   def _expand_paths(paths: list) -> list:
+      """Replaces directories (other than prepared datasets) by the CSV files they contain."""
+      expanded = []
+      for path in paths:
+         if os.path.isdir(path) and not is_prepared_dataset(path):
+            expanded.extend(sorted(glob.glob(os.path.join(path, '*.csv'))))
+         else:
+            expanded.append(path)
+      return expanded
+
+
+   @traced()
+   def read_dataset(self, csv_path: str, chunksize: int = DEFAULT_CHUNKSIZE, use_cache: bool = True,
+                    progress=None, cancel_event=None) -> Dataset:
       """
-      Loads and validates the CSV file at the given path.
+      Reads and validates a CSV file into a new Dataset without changing the current one,
+      so it can safely run on a worker thread.
+      If csv_path is a prepared dataset directory, it is memory-mapped instead.
+      The header is validated before any of the body is read, then the body is
+      ingested chunksize rows at a time so peak memory stays near the final size.
+      If a sidecar of the same file content exists it is read instead of the CSV;
+      otherwise one is written after validation. use_cache=False bypasses both.
+
+      progress (callable): Called with the fraction of the file read after each chunk
+      cancel_event (threading.Event): When set, the load stops with LoadCancelledError
+
       Raises InvalidFileFormatError if the file format is incorrect.
       """
-      self.df = pd.read_csv(csv_path).copy()
+      if is_prepared_dataset(csv_path):
+         return self.open_prepared(csv_path)
+
+      dataset = None
+      sidecar_key = None
+      if use_cache and self.sidecar_cache is not None:
+         sidecar_key = self.sidecar_cache.key_for(csv_path)
+         dataset = self.sidecar_cache.load(sidecar_key)
+
+      if dataset is None:
+         columns = self._read_header(csv_path)
+         self._validate_header(columns)
+         dataset = self._read_body(csv_path, columns, chunksize, progress, cancel_event)
+
+         if sidecar_key is not None:
+            self.sidecar_cache.store(sidecar_key, dataset)
+
+      return dataset
+
+
+   @traced()
+   def read_appended(self, csv_path: str, dataset: Dataset, start: int, end: int,
+                     chunksize: int = DEFAULT_CHUNKSIZE, cancel_event=None) -> Dataset:
+      """
+      Reads the rows written to csv_path between byte offsets start and end,
+      which must have been appended after the rows already in dataset, and
+      returns a new Dataset with both. Only the appended rows are parsed; an
+      (indicator, country) pair they repeat takes the appended row, missing
+      values included, exactly as read_dataset of the whole file would.
+      The header must not have changed. Raises InvalidFileFormatError and
+      LoadCancelledError like read_dataset.
+      """
+      columns = self._read_header(csv_path)
+      with open(csv_path, 'rb') as f:
+         f.seek(start)
+         appended = io.BytesIO(f.read(end - start))
+
+      if not appended.getvalue().strip():
+         return dataset
+
+      try:
+         appended_dataset = self._read_rows(appended, end - start, columns, False, chunksize,
+                                            cancel_event=cancel_event)
+      except InvalidFileFormatError:
+         # Problems are reported on their line of the whole file; the lines
+         # before the appended rows are only counted when there is one
+         appended.seek(0)
+         self._read_rows(appended, end - start, columns, False, chunksize,
+                         first_line=self._count_lines(csv_path, start) + 1)
+         raise
+      return append_rows(dataset, appended_dataset)
+
+
+   def open_prepared(self, directory: str) -> Dataset:
+      """
+      Returns the prepared dataset in directory, memory-mapped: memory use then
+      depends on the queries run, not on the size of the dataset.
+      """
+      try:
+         return load_dataset(directory, mmap=True)
+      except (OSError, ValueError, KeyError) as e:
+         raise InvalidFileFormatError(f"The prepared dataset could not be opened: {e}")
+
+
+   def prepare_dataset(self, csv_path: str, directory: str, chunksize: int = DEFAULT_CHUNKSIZE):
+      """Validates a CSV file and writes it to directory as a prepared on-disk dataset."""
+      save_dataset(self.read_dataset(csv_path, chunksize, use_cache=False), directory)
+
+
+   def _read_header(self, csv_path: str) -> pd.Index:
+      """Reads only the header line and returns the stripped column names."""
+      try:
+         columns = pd.read_csv(csv_path, nrows=0).columns
+      except (pd.errors.EmptyDataError, pd.errors.ParserError) as e:
+         raise InvalidFileFormatError(f"The file could not be read as CSV: {e}")
+
       # Remove leading/trailing whitespace from column names
-      self.df.columns = self.df.columns.str.strip()
+      return columns.str.strip()
 
-      required_columns = [self.country_col, self.indicator_col]
-      if not set(required_columns).issubset(self.df.columns):
-         self.df = None
-         raise InvalidFileFormatError(f"The file must include {self.country_col} and {self.indicator_col}.")
-      
-      # Validate year columns (columns after first 2: COUNTRY and INDICATOR)
-      for year in self.df.columns[2:]:
-         # Accept years 1900 to 2099
-         if not re.match("^(19|20)\d{2}$", year):
-            self.df = None
-            raise InvalidFileFormatError(
-               f"Invalid year column: '{year}'. "
-                "Year columns must be between 1900 and 2099."
-               )
-         elif (not self._is_year_increasing(year)):
-            raise InvalidFileFormatError(
-               f"Numbers must be in strictly increasing order without gaps"
-               )
 
+   def _validate_header(self, columns: pd.Index):
+      """Checks label and year columns. Raises InvalidFileFormatError listing every problem."""
+      issues = validate_header(columns, self.country_col, self.indicator_col)
+      if issues:
+         raise InvalidFileFormatError(issues=issues)
 
-      for t in self.df.dtypes[:2]:
-         if not pd.api.types.is_string_dtype(t):
-            self.df = None
-            raise InvalidFileFormatError(
-               f"Column '{t}' must be of type text."
-               )
-         
-      for t in self.df.dtypes[2:]:
-         if not pd.api.types.is_numeric_dtype(t):
-            self.df = None
-            raise InvalidFileFormatError(
-               f"Column '{t}' must be a numeric type."
-               )
+
+   @traced()
+   def _read_body(self, csv_path: str, columns: pd.Index, chunksize: int,
+                  progress=None, cancel_event=None) -> Dataset:
+      """
+      Ingests the CSV body chunk by chunk into a Dataset.
+      Labels are dictionary-encoded as they arrive and year values are written
+      into one float block preallocated from the file size, so no chunk is kept
+      around once it has been copied in.
+      Type problems are collected over the whole file and raised together at the end.
+      """
+      with open(csv_path, 'rb') as f:
+         return self._read_rows(f, os.path.getsize(csv_path), columns, True, chunksize, progress, cancel_event)
+
+
+   def _read_rows(self, f, file_size: int, columns: pd.Index, has_header: bool, chunksize: int,
+                  progress=None, cancel_event=None, first_line: int = 2) -> Dataset:
+      """
+      Ingests the CSV rows of the binary file object f (file_size bytes long), see _read_body.
+      first_line is the file line number of the first row, used to report problems.
+      """
+      years = columns[2:]
+      validator = ChunkValidator(columns, [self.country_col, self.indicator_col], first_line)
+
+      label_tables = {self.country_col: {}, self.indicator_col: {}}
+      label_codes = {self.country_col: [], self.indicator_col: []}
+      values = np.empty((0, len(years)))
+      n_rows = 0
+
+      reader = pd.read_csv(f, header=0 if has_header else None, names=columns, chunksize=chunksize)
+      for chunk in reader:
+         chunk_values = validator.check(chunk)
+
+         for col, table in label_tables.items():
+            label_codes[col].append(self._encode_labels(chunk[col], table))
+
+         # Grow the block to the estimated row count of the whole file
+         needed = n_rows + len(chunk)
+         if needed > len(values):
+            bytes_per_row = max(f.tell(), 1) / needed
+            estimate = int(file_size / bytes_per_row * 1.05) + 1
+            capacity = max(needed, estimate, int(len(values) * 1.25))
+            grown = np.empty((capacity, len(years)))
+            grown[:n_rows] = values[:n_rows]
+            values = grown
+
+         values[n_rows:needed] = chunk_values
+         n_rows = needed
+
+         if progress is not None:
+            progress(min(f.tell() / max(file_size, 1), 1.0))
+         if cancel_event is not None and cancel_event.is_set():
+            raise LoadCancelledError("The file load was cancelled.")
+
+      issues = validator.issues()
+      if issues:
+         raise InvalidFileFormatError(issues=issues)
+
+      # Trim the unused tail only when it is worth a copy
+      values = values[:n_rows]
+      if values.base is not None and values.base.shape[0] > n_rows * 1.1:
+         values = values.copy()
+
+      codes, labels = {}, {}
+      for col, table in label_tables.items():
+         chunk_codes = np.concatenate(label_codes[col]) if label_codes[col] else np.empty(0, dtype=np.int32)
+         codes[col], labels[col] = self._sort_labels(chunk_codes, table)
+
+      return Dataset.from_rows(
+         codes[self.country_col], codes[self.indicator_col], values,
+         labels[self.country_col], labels[self.indicator_col], years,
+         self.country_col, self.indicator_col
+         )
+
+
+   @staticmethod
+   def _count_lines(csv_path: str, end: int) -> int:
+      """Counts the line breaks in the first end bytes of the file."""
+      lines = 0
+      with open(csv_path, 'rb') as f:
+         remaining = end
+         while remaining > 0:
+            block = f.read(min(remaining, 1 << 20))
+            if not block:
+               break
+            lines += block.count(b'\n')
+            remaining -= len(block)
+      return lines
+
+
+   @staticmethod
+   def _encode_labels(labels: pd.Series, table: dict) -> np.ndarray:
+      """Maps labels to integer codes, adding unseen labels to table. NaN becomes -1."""
+      codes, uniques = pd.factorize(labels)
+      mapping = np.array([table.setdefault(label, len(table)) for label in uniques], dtype=np.int32)
+
+      if len(mapping) == 0:
+         return np.full(len(codes), -1, dtype=np.int32)
+      return np.where(codes < 0, -1, mapping[codes]).astype(np.int32)
+
+
+   @staticmethod
+   def _sort_labels(codes: np.ndarray, table: dict) -> tuple:
+      """Returns (codes, labels) re-numbered so that labels are sorted alphabetically."""
+      labels = np.array(list(table), dtype=object)
+      order = np.argsort(labels, kind='stable')
+
+      # Re-number codes so that code order matches alphabetical order
+      rank = np.empty(len(order), dtype=np.int32)
+      rank[order] = np.arange(len(order), dtype=np.int32)
+      sorted_codes = np.where(codes < 0, -1, rank[codes] if len(rank) else codes)
+
+      return sorted_codes.astype(np.int32), labels[order]
    
 
+   @traced()
    def get_indicators (self) -> list:
       """returns a list of indicators"""
-      return sorted(self.df[self.indicator_col].unique().tolist())
+      return self.dataset.get_indicators()
    
 
    def get_years_columns(self) -> list:
       """returns a list of years columns as strings"""
-      return self.df.columns[2:]
+      return self.dataset.get_years_columns()
       
 
-   def get_delta_df(self, indicator: str, start_year: str, end_year: str) -> pd.DataFrame:
+   @traced()
+   def get_delta_df(self, indicator: str, start_year: str, end_year: str, dataset: Dataset = None,
+                    use_cache: bool = True) -> pd.DataFrame:
       """
       Returns a DataFrame with countries, start year, end year, and delta percentage
       for the specified indicator between the given years.
+      Uses the current dataset unless another snapshot is given.
+      Results are served from the LRU cache when the same query was computed
+      on the same dataset; a copy is returned so the cache stays untouched.
+      use_cache=False computes the result without reading or filling the cache.
+      """
+      dataset = dataset or self.dataset
+      if not use_cache:
+         return self._compute_delta_df(dataset, indicator, start_year, end_year)
+
+      key = (dataset.dataset_id, indicator, str(start_year), str(end_year))
+      delta_df = self.cache.get(key)
+
+      if delta_df is None:
+         delta_df = self._compute_delta_df(dataset, indicator, start_year, end_year)
+         self.cache.put(key, delta_df)
+
+      return delta_df.copy()
+
+
+   def _compute_delta_df(self, dataset: Dataset, indicator: str, start_year: str, end_year: str,
+                         rows=slice(None)) -> pd.DataFrame:
+      """
+      Computes the delta DataFrame of get_delta_df without using the cache,
+      for the rows (positions in the indicator block) selected by rows.
       """
-      # Filter to get specified indicator data, sort countries alphabetically, remove indicator column
-      filtered_df = (
-         self.df[self.df[self.indicator_col] == indicator]
-              .sort_values(by=self.country_col, ascending=True)
-              .drop(columns=[self.indicator_col])
-              .reset_index(drop=True)
-      )
+      # Indicator block is already sorted alphabetically by country
+      country_codes, values = dataset.indicator_block(indicator)
+      start_values = values[rows, dataset.year_position(start_year)]
+      end_values = values[rows, dataset.year_position(end_year)]
 
       # Create new df: Countries, start year value, end year value, and delta percentage
-      delta_df = filtered_df.loc[:, [self.country_col, start_year, end_year]]
-      
-      delta_df['delta'] = delta_df.apply(
-         lambda row: np.nan if row[start_year] == 0     # Avoid division by zero
-         else round(((row[end_year] - row[start_year]) 
-                     / row[start_year]) * 100, 3),
-            axis=1
+      return pd.DataFrame({
+         self.country_col: dataset.countries[country_codes[rows]],
+         start_year: start_values,
+         end_year: end_values,
+         'delta': self._compute_delta(start_values, end_values),
+         })
+
+
+   @traced(rows=lambda handler, result: len(result))
+   def run_query(self, query: Query, dataset: Dataset = None) -> pd.DataFrame:
+      """
+      Returns the table described by query, evaluated in the cheapest order:
+      the countries are selected first, then only the delta and the requested
+      statistics are computed, for the selected countries only, and the rows
+      are sorted last.
+      The unsorted table and its sort orders are cached per query, so repeating
+      a query, or changing only its sort, computes nothing again.
+      """
+      dataset = dataset or self.dataset
+      unsorted_query = query._replace(sort_col=None, ascending=True)
+      key = (dataset.dataset_id, 'query', unsorted_query)
+      view = self.cache.get(key)
+
+      if view is None:
+         view = SortedView(self._evaluate_query(dataset, unsorted_query))
+         self.cache.put(key, view)
+
+      if query.sort_col is None:
+         return view.df.copy()
+      return view.df.take(view.order(query.sort_col, query.ascending))
+
+
+   def _evaluate_query(self, dataset: Dataset, query: Query) -> pd.DataFrame:
+      """Computes the unsorted table of run_query without using the cache."""
+      rows = slice(None)
+      if query.countries:
+         country_codes, _ = dataset.indicator_block(query.indicator)
+         selected_codes = np.flatnonzero(np.isin(dataset.countries, list(query.countries)))
+         rows = np.flatnonzero(np.isin(country_codes, selected_codes))
+
+      query_df = self._compute_delta_df(dataset, query.indicator, query.start_year, query.end_year, rows)
+
+      if query.statistics:
+         statistics = compute_statistics(
+            self.get_range_tables(query.indicator, dataset),
+            dataset.year_position(query.start_year),
+            dataset.year_position(query.end_year),
+            query.statistics,
+            rows
+            )
+         for name, column in statistics.items():
+            query_df[name] = column
+
+      return query_df
+
+
+   @traced()
+   def get_range_tables(self, indicator: str, dataset: Dataset = None) -> RangeTables:
+      """
+      Returns the prefix sums and sparse tables of an indicator, which answer
+      any year range aggregate in constant time per country.
+      They are built the first time an indicator is queried, then cached, so
+      scrubbing through year ranges never scans the year columns again.
+      """
+      dataset = dataset or self.dataset
+      key = (dataset.dataset_id, 'tables', indicator)
+      tables = self.cache.get(key)
+
+      if tables is None:
+         _, values = dataset.indicator_block(indicator)
+         tables = RangeTables(values, dataset.get_years_columns())
+         self.cache.put(key, tables)
+
+      return tables
+
+
+   @traced()
+   def get_correlation_df(self, start_year: str, end_year: str, mode: str = 'delta',
+                          dataset: Dataset = None) -> pd.DataFrame:
+      """
+      Returns the correlation matrix of all indicators between the given years,
+      as a DataFrame with one row and one column per indicator.
+      mode is 'delta' (% change of each country over the range) or 'yoy'
+      (every year-over-year % change of each country), see correlation.py.
+      Results are cached per year range and mode; a copy is returned.
+      """
+      dataset = dataset or self.dataset
+      key = (dataset.dataset_id, 'correlation', mode, str(start_year), str(end_year))
+      correlation_df = self.cache.get(key)
+
+      if correlation_df is None:
+         observations = indicator_observations(
+            dataset,
+            dataset.year_position(start_year),
+            dataset.year_position(end_year),
+            mode
+            )
+         # Indicators without any row have no observations
+         codes = np.flatnonzero(np.diff(dataset.indptr) > 0)
+         indicators = dataset.indicators[codes]
+         correlation_df = pd.DataFrame(
+            np.round(correlation_matrix(observations[:, codes]), 3),
+            index=pd.Index(indicators, name=self.indicator_col),
+            columns=indicators
+            )
+         self.cache.put(key, correlation_df)
+
+      return correlation_df.copy()
+
+
+   @traced()
+   def get_delta_batch(self, indicator: str, year_ranges: list) -> pd.DataFrame:
+      """
+      Returns a DataFrame with countries and one delta percentage column per
+      (start_year, end_year) pair, named 'start_year-end_year'.
+      All pairs are computed together in a single array operation.
+      """
+      country_codes, values = self.dataset.indicator_block(indicator)
+
+      # Positions of every start and end year on the year axis
+      starts = [self.dataset.year_position(start_year) for start_year, _ in year_ranges]
+      ends = [self.dataset.year_position(end_year) for _, end_year in year_ranges]
+
+      deltas = self._compute_delta(values[:, starts], values[:, ends])
+
+      batch_df = pd.DataFrame(
+         deltas,
+         columns=[f"{start_year}-{end_year}" for start_year, end_year in year_ranges]
          )
-      return delta_df
+      batch_df.insert(0, self.country_col, self.dataset.countries[country_codes])
+      return batch_df
+
+
+   def cache_info(self):
+      """returns hits, misses, maxsize and current size of the delta cache"""
+      return self.cache.info()
 
 
    def get_country_col(self):
@@ -121,33 +579,25 @@ class DataHandler:
       return self.indicator_col
    
 
-   def toggle_sort(self, icol: int, df: pd.DataFrame) -> pd.DataFrame:
+   @staticmethod
+   def _compute_delta(start_values: np.ndarray, end_values: np.ndarray) -> np.ndarray:
       """
-      Toggles ascending sorting of the DataFrame based on the clicked column index.
-      If the same column is clicked again, it reverses the sort order.
+      Vectorized percentage change between two arrays of the same shape.
+      Returns NaN where the start value is 0, rounded to 3 decimals otherwise.
       """
-      if self.icol_prec!=icol:
-         self.toggle=0
-      else :
-         # Toggle between 0 and 1 to reverse sort order
-         self.toggle=1-self.toggle
+      with np.errstate(divide='ignore', invalid='ignore'):
+         delta = ((end_values - start_values) / start_values) * 100
 
-      self.icol_prec=icol
+      # Avoid division by zero
+      delta = np.where(start_values == 0, np.nan, delta)
+      return np.round(delta, 3)
 
-      if self.toggle==0:
-         return df.sort_values(by=df.columns[icol], ascending=True)
-      else :
-         return df.sort_values(by=df.columns[icol], ascending=False)
-      
 
-   def _is_year_increasing(self, year):
-      '''Check if the year is in strictly increasing order without gaps'''
-      years = self.get_years_columns() 
-      
-      current_index = years.get_loc(year)
-      if current_index == 0:
-         return True
-      else:
-         prev_year = years[current_index - 1]
-         return int(year) == int(prev_year) + 1
-      
\ No newline at end of file
+def _read_dataset_in_worker(sidecar_cache: SidecarCache, path: str, chunksize: int, use_cache: bool) -> Dataset:
+   """Process pool entry point of DataHandler.read_paths: reads one file into memory."""
+   dataset = DataHandler(cache_size=0, sidecar_cache=sidecar_cache).read_dataset(path, chunksize, use_cache)
+   # Memory-mapped arrays would be pickled lazily by reference to a file; send plain arrays
+   if isinstance(dataset.values, np.memmap) or isinstance(dataset.values.base, np.memmap):
+      dataset.values = np.ascontiguousarray(dataset.values)
+      dataset.country_codes = np.asarray(dataset.country_codes).copy()
+   return dataset
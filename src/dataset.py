@@ -0,0 +1,228 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+
+# Every snapshot gets a process-wide unique identity, used as a cache key
+_dataset_ids = itertools.count(1)
+
+
+class Dataset:
+    """
+    Immutable snapshot of a loaded and validated data file, stored as a sparse
+    (indicator x country x year) cube with dictionary-encoded labels.
+
+    Responsible for:
+    - Holding the year values of every (indicator, country) pair as one float block
+    - Mapping integer codes to country and indicator labels
+    - Serving the country-ordered block of an indicator as an array slice
+
+    Rows are sorted by indicator code then country code, and indptr gives the
+    row range of each indicator (the CSR layout of a sparse matrix), so an
+    indicator's countries are values[indptr[i]:indptr[i + 1]] without any copy.
+    Label dictionaries are sorted alphabetically, so code order is label order.
+
+    A Dataset is never modified after construction, so it can be built on a
+    worker thread and swapped in by reference.
+
+    Args:
+        countries (np.ndarray): Country labels, sorted, indexed by country code
+        indicators (np.ndarray): Indicator labels, sorted, indexed by indicator code
+        years (pd.Index): Year column names, as strings
+        indptr (np.ndarray): Row range [indptr[i], indptr[i + 1]) of indicator code i
+        country_codes (np.ndarray): Country code of every row
+        values (np.ndarray): Year values, shape (rows, years)
+        country_col (str): Name of the country column
+        indicator_col (str): Name of the indicator column
+
+    Attributes:
+        dataset_id (int): Unique identity of this snapshot
+    """
+
+    def __init__(self, countries, indicators, years, indptr, country_codes, values,
+                 country_col: str, indicator_col: str):
+        self.countries = countries
+        self.indicators = indicators
+        self.years = pd.Index(years)
+        self.indptr = indptr
+        self.country_codes = country_codes
+        self.values = values
+        self.country_col = country_col
+        self.indicator_col = indicator_col
+
+        self.dataset_id = next(_dataset_ids)
+        self._year_positions = {year: i for i, year in enumerate(self.years)}
+        self._indicator_codes = {indicator: i for i, indicator in enumerate(self.indicators)}
+
+
+    @classmethod
+    def from_rows(cls, country_codes, indicator_codes, values, countries, indicators, years,
+                  country_col: str, indicator_col: str):
+        """
+        Build a dataset from rows in file order. Codes index the sorted label arrays.
+        values is reordered in place, one year column at a time, so the only extra
+        memory is one column. When a (indicator, country) pair appears more than
+        once, the last row in file order is kept.
+        """
+        order = np.lexsort((country_codes, indicator_codes))
+        for j in range(values.shape[1]):
+            values[:, j] = values[order, j]
+        country_codes = country_codes[order]
+        indicator_codes = indicator_codes[order]
+
+        # lexsort is stable: within a duplicated pair, the last row is the last in the file
+        last = np.ones(len(order), dtype=bool)
+        last[:-1] = (country_codes[1:] != country_codes[:-1]) | (indicator_codes[1:] != indicator_codes[:-1])
+        if not last.all():
+            values = values[last]
+            country_codes = country_codes[last]
+            indicator_codes = indicator_codes[last]
+
+        indptr = np.searchsorted(indicator_codes, np.arange(len(indicators) + 1)).astype(np.int64)
+        return cls(countries, indicators, years, indptr, country_codes.astype(np.int32), values,
+                   country_col, indicator_col)
+
+
+    def __len__(self):
+        return len(self.values)
+
+
+    def get_indicators(self) -> list:
+        """Return the indicators in alphabetical order."""
+        return [indicator for i, indicator in enumerate(self.indicators) if self.indptr[i + 1] > self.indptr[i]]
+
+
+    def get_years_columns(self) -> pd.Index:
+        """Return the year columns as strings."""
+        return self.years
+
+
+    def year_position(self, year) -> int:
+        """Return the position of a year on the year axis. Raises KeyError if absent."""
+        return self._year_positions[str(year)]
+
+
+    def indicator_code(self, indicator: str) -> int:
+        """Return the code of an indicator, or -1 if it is not in the dataset."""
+        return self._indicator_codes.get(indicator, -1)
+
+
+    def indicator_block(self, indicator: str) -> tuple:
+        """
+        Return (country_codes, values) of an indicator, ordered by country.
+        Both are views into the dataset: no data is copied.
+        """
+        code = self.indicator_code(indicator)
+        if code < 0:
+            return self.country_codes[:0], self.values[:0]
+
+        rows = slice(self.indptr[code], self.indptr[code + 1])
+        return self.country_codes[rows], self.values[rows]
+
+
+    def row_indicator_codes(self) -> np.ndarray:
+        """Return the indicator code of every row (the inverse of indptr)."""
+        return np.repeat(np.arange(len(self.indicators)), np.diff(self.indptr))
+
+
+# How overlapping non-missing cells are resolved when merging datasets
+MERGE_CONFLICT_RULES = ('last', 'first', 'error')
+
+
+class MergeConflictError(ValueError):
+    """Raised by merge_datasets when overlapping cells disagree and conflict='error'"""
+    pass
+
+
+def merge_datasets(datasets: list, conflict: str = 'last') -> Dataset:
+    """
+    Merge datasets into one covering every country, indicator and year of any of them.
+
+    The year axis spans the earliest to the latest year of all datasets, years
+    that no dataset has are left missing. A cell present in several datasets
+    (same indicator, country and year, not missing) is resolved by conflict:
+    - 'last': the value of the last dataset in the list wins
+    - 'first': the value of the first dataset in the list wins
+    - 'error': MergeConflictError is raised if the values differ
+    A missing value never replaces a present one.
+    """
+    if conflict not in MERGE_CONFLICT_RULES:
+        raise ValueError(f"Unknown conflict rule: '{conflict}'. Use one of {', '.join(MERGE_CONFLICT_RULES)}.")
+    if len(datasets) == 1:
+        return datasets[0]
+
+    countries = np.array(sorted(set().union(*(dataset.countries for dataset in datasets))), dtype=object)
+    indicators = np.array(sorted(set().union(*(dataset.indicators for dataset in datasets))), dtype=object)
+    first_year = min(int(dataset.years[0]) for dataset in datasets if len(dataset.years))
+    last_year = max(int(dataset.years[-1]) for dataset in datasets if len(dataset.years))
+    years = [str(year) for year in range(first_year, last_year + 1)]
+
+    # Each row is keyed by indicator code * number of countries + country code,
+    # so sorting keys orders rows by indicator then country
+    keys = []
+    for dataset in datasets:
+        country_map = np.searchsorted(countries, dataset.countries).astype(np.int64)
+        indicator_map = np.searchsorted(indicators, dataset.indicators).astype(np.int64)
+        keys.append(indicator_map[dataset.row_indicator_codes()] * len(countries) + country_map[dataset.country_codes])
+
+    unique_keys = np.unique(np.concatenate(keys)) if keys else np.empty(0, dtype=np.int64)
+    values = np.full((len(unique_keys), len(years)), np.nan)
+
+    conflicts = 0
+    for dataset, dataset_keys in zip(datasets, keys):
+        rows = np.searchsorted(unique_keys, dataset_keys)
+        offset = int(dataset.years[0]) - first_year if len(dataset.years) else 0
+
+        for j in range(len(dataset.years)):
+            incoming = np.asarray(dataset.values[:, j])
+            current = values[rows, offset + j]
+            present = ~np.isnan(incoming)
+            overlap = present & ~np.isnan(current)
+
+            if conflict == 'error':
+                conflicts += int(np.count_nonzero(overlap & (current != incoming)))
+            if conflict == 'first':
+                present &= ~overlap
+
+            values[rows[present], offset + j] = incoming[present]
+
+    if conflicts:
+        raise MergeConflictError(
+            f"{conflicts} cell(s) have different values in several files for the same indicator, country and year."
+            )
+
+    indicator_codes = unique_keys // max(len(countries), 1)
+    country_codes = (unique_keys % max(len(countries), 1)).astype(np.int32)
+    indptr = np.searchsorted(indicator_codes, np.arange(len(indicators) + 1)).astype(np.int64)
+
+    first = datasets[0]
+    return Dataset(countries, indicators, years, indptr, country_codes, values,
+                   first.country_col, first.indicator_col)
+
+
+def append_rows(dataset: Dataset, appended: Dataset) -> Dataset:
+    """
+    Return a dataset with the rows of appended after those of dataset, as if
+    they had been appended to its file. As in Dataset.from_rows, an (indicator,
+    country) pair found in both takes the whole row of appended, missing
+    values included. Both datasets must have the same years.
+    """
+    if list(dataset.years) != list(appended.years):
+        raise ValueError("Rows can only be appended to a dataset with the same year columns.")
+
+    countries = np.array(sorted(set(dataset.countries) | set(appended.countries)), dtype=object)
+    indicators = np.array(sorted(set(dataset.indicators) | set(appended.indicators)), dtype=object)
+
+    country_codes, indicator_codes = [], []
+    for part in (dataset, appended):
+        country_map = np.searchsorted(countries, part.countries).astype(np.int32)
+        indicator_map = np.searchsorted(indicators, part.indicators).astype(np.int32)
+        country_codes.append(country_map[part.country_codes])
+        indicator_codes.append(indicator_map[part.row_indicator_codes()])
+
+    # from_rows reorders values in place: the concatenation is its own copy
+    values = np.concatenate([np.asarray(dataset.values, dtype=float), np.asarray(appended.values, dtype=float)])
+    return Dataset.from_rows(
+        np.concatenate(country_codes), np.concatenate(indicator_codes), values,
+        countries, indicators, dataset.years, dataset.country_col, dataset.indicator_col
+        )
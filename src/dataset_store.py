@@ -0,0 +1,84 @@
+import json
+import os
+
+import numpy as np
+
+from dataset import Dataset
+
+# Bump whenever the on-disk layout changes so older datasets are rejected
+FORMAT_VERSION = 3
+META_FILE = 'meta.json'
+
+# Label index arrays, each stored as <name>.npy
+LABEL_ARRAYS = ('countries', 'indicators', 'indptr', 'country_codes')
+# Year values, stored year-major: one contiguous run of rows per year
+VALUES_FILE = 'values_by_year.npy'
+
+
+def is_prepared_dataset(path: str) -> bool:
+    """Return True if path is a directory holding a prepared dataset."""
+    return os.path.isdir(path) and os.path.exists(os.path.join(path, META_FILE))
+
+
+def save_dataset(dataset: Dataset, directory: str):
+    """
+    Write dataset as a prepared on-disk dataset: .npy label index arrays plus the
+    year values in year-major order, so one year column of one indicator is a
+    single contiguous range of the file.
+    The values file is filled one year at a time to avoid a transposed copy in memory.
+    """
+    os.makedirs(directory, exist_ok=True)
+
+    np.save(os.path.join(directory, 'countries.npy'), np.array(dataset.countries, dtype=str))
+    np.save(os.path.join(directory, 'indicators.npy'), np.array(dataset.indicators, dtype=str))
+    np.save(os.path.join(directory, 'indptr.npy'), np.asarray(dataset.indptr))
+    np.save(os.path.join(directory, 'country_codes.npy'), np.asarray(dataset.country_codes))
+
+    rows, years = dataset.values.shape
+    by_year = np.lib.format.open_memmap(
+        os.path.join(directory, VALUES_FILE), mode='w+', dtype=np.float64, shape=(years, rows)
+        )
+    for j in range(years):
+        by_year[j] = dataset.values[:, j]
+    by_year.flush()
+    del by_year
+
+    # Written last: a directory without meta.json is never opened
+    with open(os.path.join(directory, META_FILE), 'w') as f:
+        json.dump({
+            'version': FORMAT_VERSION,
+            'years': [str(year) for year in dataset.years],
+            'country_col': dataset.country_col,
+            'indicator_col': dataset.indicator_col,
+            }, f)
+
+
+def load_dataset(directory: str, mmap: bool = True) -> Dataset:
+    """
+    Open a prepared dataset. With mmap, year values and country codes stay on
+    disk and only the pages a query touches are read; labels are loaded in memory.
+    Raises ValueError if the directory does not hold a dataset of this version.
+    """
+    with open(os.path.join(directory, META_FILE)) as f:
+        meta = json.load(f)
+    if meta.get('version') != FORMAT_VERSION:
+        raise ValueError(f"'{directory}' is not a prepared dataset of format version {FORMAT_VERSION}.")
+
+    mmap_mode = 'r' if mmap else None
+    arrays = {
+        name: np.load(os.path.join(directory, f'{name}.npy'), mmap_mode=mmap_mode if name == 'country_codes' else None)
+        for name in LABEL_ARRAYS
+    }
+    by_year = np.load(os.path.join(directory, VALUES_FILE), mmap_mode=mmap_mode)
+
+    return Dataset(
+        arrays['countries'].astype(object),
+        arrays['indicators'].astype(object),
+        meta['years'],
+        arrays['indptr'],
+        arrays['country_codes'],
+        # Transposed view: (rows, years) indexing over year-major storage, no copy
+        by_year.T,
+        meta['country_col'],
+        meta['indicator_col']
+        )
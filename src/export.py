@@ -0,0 +1,158 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+# File formats a table can be exported to, by file extension
+EXPORT_FORMATS = ('csv', 'parquet', 'jsonl')
+
+# Columns of the combined delta table of several indicators
+OUTPUT_COLUMNS = ['INDICATOR', 'COUNTRY', 'START_YEAR', 'END_YEAR', 'START_VALUE', 'END_VALUE', 'DELTA']
+
+# Rows formatted and written at a time when exporting a table
+EXPORT_CHUNK_ROWS = 50_000
+
+
+class ExportCancelledError(Exception):
+    """Raised when an export is cancelled; the partial file is removed"""
+    pass
+
+
+class TableWriter:
+    """
+    Appends tables to a CSV, Parquet or JSON Lines file as they are produced,
+    so the whole result never has to be held in memory.
+
+    Args:
+        path (str): Output file; its extension selects the format
+        columns (list): Header written to an empty CSV file
+
+    Attributes:
+        format (str): One of EXPORT_FORMATS
+        rows (int): Number of rows written so far
+    """
+
+    def __init__(self, path: str, columns: list = OUTPUT_COLUMNS):
+        self.path = path
+        self.columns = columns
+        self.format = os.path.splitext(path)[1].lower().lstrip('.')
+        if self.format not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported output format: '{path}'. Use .csv, .parquet or .jsonl.")
+
+        self.rows = 0
+        self._parquet_writer = None
+
+        if self.format == 'parquet':
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                raise ValueError("Writing Parquet files requires the pyarrow package.")
+
+
+    def write(self, table: pd.DataFrame):
+        if self.format == 'csv':
+            table.to_csv(self.path, mode='w' if self.rows == 0 else 'a', header=self.rows == 0, index=False)
+        elif self.format == 'jsonl':
+            with open(self.path, 'w' if self.rows == 0 else 'a', encoding='utf-8') as f:
+                # Missing values become null, as JSON has no NaN
+                records = table.astype(object).where(table.notna(), None).to_dict('records')
+                for record in records:
+                    f.write(json.dumps(record, ensure_ascii=False, default=_json_value) + '\n')
+        else:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            arrow_table = pa.Table.from_pandas(table, preserve_index=False)
+            if self._parquet_writer is None:
+                self._parquet_writer = pq.ParquetWriter(self.path, arrow_table.schema)
+            self._parquet_writer.write_table(arrow_table)
+
+        self.rows += len(table)
+
+
+    def close(self):
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+        elif self.rows == 0 and self.format == 'csv':
+            pd.DataFrame(columns=self.columns).to_csv(self.path, index=False)
+        elif self.rows == 0 and self.format == 'jsonl':
+            open(self.path, 'w').close()
+
+
+def delta_table(data_handler, indicator: str, start_year: str, end_year: str, dataset=None,
+                use_cache: bool = True) -> pd.DataFrame:
+    """Delta table of one indicator between two years, in OUTPUT_COLUMNS layout."""
+    country_col = data_handler.get_country_col()
+    delta_df = data_handler.get_delta_df(indicator, start_year, end_year, dataset=dataset, use_cache=use_cache)
+
+    return pd.DataFrame({
+        'INDICATOR': indicator,
+        'COUNTRY': delta_df[country_col],
+        'START_YEAR': int(start_year),
+        'END_YEAR': int(end_year),
+        'START_VALUE': delta_df[start_year],
+        'END_VALUE': delta_df[end_year],
+        'DELTA': delta_df['delta'],
+        })
+
+
+def export_table(df: pd.DataFrame, path: str, progress=None, cancel_event=None) -> int:
+    """
+    Write df to path, EXPORT_CHUNK_ROWS rows at a time.
+    Returns the number of rows written.
+    """
+    chunks = (df.iloc[start:start + EXPORT_CHUNK_ROWS] for start in range(0, len(df), EXPORT_CHUNK_ROWS))
+    return _export(chunks, max(1, -(-len(df) // EXPORT_CHUNK_ROWS)), path, list(df.columns),
+                   progress, cancel_event)
+
+
+def export_all_indicators(data_handler, start_year: str, end_year: str, path: str, dataset=None,
+                          progress=None, cancel_event=None) -> int:
+    """
+    Write the deltas of every indicator between two years to path, in
+    OUTPUT_COLUMNS layout. Indicators are computed and written one at a time,
+    without going through the result cache. Returns the number of rows written.
+    """
+    dataset = dataset or data_handler.dataset
+    indicators = dataset.get_indicators()
+    tables = (
+        delta_table(data_handler, indicator, start_year, end_year, dataset=dataset, use_cache=False)
+        for indicator in indicators
+        )
+    return _export(tables, len(indicators), path, OUTPUT_COLUMNS, progress, cancel_event)
+
+
+def _export(tables, count: int, path: str, columns: list, progress, cancel_event) -> int:
+    """
+    Write the count tables produced by tables to path. The file is written
+    under a temporary name and only renamed to path once complete, so a failed
+    or cancelled export never leaves a truncated file behind.
+    """
+    partial_path = path + '.part' + os.path.splitext(path)[1]
+    writer = TableWriter(partial_path, columns)
+
+    try:
+        try:
+            for done, table in enumerate(tables, 1):
+                if cancel_event is not None and cancel_event.is_set():
+                    raise ExportCancelledError("The export was cancelled.")
+                writer.write(table)
+                if progress is not None:
+                    progress(done / count)
+        finally:
+            writer.close()
+        os.replace(partial_path, path)
+    except BaseException:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        raise
+
+    return writer.rows
+
+
+def _json_value(value):
+    """Convert the numpy scalars json cannot serialize."""
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
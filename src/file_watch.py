@@ -0,0 +1,95 @@
+import os
+from collections import namedtuple
+
+# What is known of a file when it was last read:
+# size and mtime from os.stat, its header line and the bytes just before its end
+FileState = namedtuple('FileState', ['size', 'mtime', 'header', 'tail'])
+
+# Bytes compared at the old end of a file to tell an append from a rewrite
+TAIL_BYTES = 4096
+
+
+def read_file_state(path: str) -> FileState:
+    """Return the current FileState of path."""
+    with open(path, 'rb') as f:
+        stat = os.fstat(f.fileno())
+        header = f.readline()
+        f.seek(max(0, stat.st_size - TAIL_BYTES))
+        tail = f.read(stat.st_size - f.tell())
+    return FileState(stat.st_size, stat.st_mtime, header, tail)
+
+
+def rows_appended(path: str, old: FileState, new: FileState) -> bool:
+    """
+    Return whether the only change from old to new is rows added at the end of
+    the file: same header, the file grew, it ends with a complete line before
+    and after (a last line still being written is not a row yet) and the bytes
+    before its old end are unchanged.
+    """
+    if new.size <= old.size or new.header != old.header:
+        return False
+    if not old.tail.endswith(b'\n') or not new.tail.endswith(b'\n'):
+        return False
+
+    with open(path, 'rb') as f:
+        f.seek(old.size - len(old.tail))
+        return f.read(len(old.tail)) == old.tail
+
+
+class FileWatcher:
+    """
+    Polls a file's size and modification time with root.after and reports changes.
+
+    A change is only reported once the file has stayed the same for one more
+    poll, so a file still being written is not read half way through.
+
+    Args:
+        root: Tk widget used to schedule the polling
+        path (str): File to watch
+        on_change (callable): Called with the new FileState on the Tk thread
+        interval_ms (int): Milliseconds between two polls (default 2000)
+        state (FileState): State to report changes from, such as the state the
+            file was read at (read when the watcher is created by default)
+
+    Attributes:
+        state (FileState): State of the file when it was last reported or started
+    """
+
+    def __init__(self, root, path: str, on_change, interval_ms: int = 2000, state: FileState = None):
+        self.root = root
+        self.path = path
+        self.on_change = on_change
+        self.interval_ms = interval_ms
+
+        self.state = state or read_file_state(path)
+        self._seen = (self.state.size, self.state.mtime)
+        self._after_id = None
+
+
+    def start(self):
+        """Start polling."""
+        self._after_id = self.root.after(self.interval_ms, self._poll)
+
+
+    def stop(self):
+        """Stop polling."""
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+
+    def _poll(self):
+        try:
+            stat = os.stat(self.path)
+            seen = (stat.st_size, stat.st_mtime)
+
+            # Report once the file is stable: unchanged since the previous poll
+            if seen == self._seen and seen != (self.state.size, self.state.mtime):
+                self.state = read_file_state(self.path)
+                self.on_change(self.state)
+            self._seen = seen
+        except OSError:
+            # The file may be replaced by its writer: try again on the next poll
+            pass
+
+        self._after_id = self.root.after(self.interval_ms, self._poll)
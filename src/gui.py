@@ -1,8 +1,28 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
+import numpy as np
+import pandas as pd
 import ttkbootstrap as tb
 
+from correlation_window import CorrelationWindow
+from indicator_stats import STATISTICS
+from instrumentation import tracer, traced
 from tooltip import ToolTip 
+from virtual_table import VirtualTable
+
+# Headings of the optional statistics columns, by indicator_stats name
+STATISTIC_HEADINGS = {
+    'mean': 'Mean',
+    'cagr': 'CAGR %',
+    'volatility': 'Volatility %',
+    'min': 'Min',
+    'min_year': 'Min year',
+    'max': 'Max',
+    'max_year': 'Max year',
+    'zscore': 'Z-score',
+    }
+# Statistics holding a year, displayed without decimals
+YEAR_STATISTICS = ('min_year', 'max_year')
 
 class GUI:
     """
@@ -25,7 +45,14 @@ class GUI:
         indicators_cb (ttk.Combobox): Dropdown for indicator selection
         start_year_spinbox, end_year_spinbox (tk.Spinbox): Year range selectors
         selected_countries (list): Countries selected for filtering
-        country_items (dict): Mapping of countries to treeview item IDs for search
+        country_items (dict): Mapping of countries to treeview item IDs
+        search_countries (pd.Series): Displayed country names, in display order
+        search_names (pd.Index): Lower-cased search_countries, or None until the next search
+        search_delay_ms (int): Keystroke debounce delay before a search runs
+        virtual_table (VirtualTable): Renders only the visible rows of large tables
+        virtual_threshold (int): Row count above which the table is rendered virtually
+        statistics_vars (dict): Check state of each statistic in the "Columns" menu
+        correlation_window (CorrelationWindow): Indicator correlation matrix window, or None
     """
     def __init__(self, controller):
         self.root = tb.Window(themename='flatly')
@@ -45,11 +72,16 @@ class GUI:
         self._build_selected_countries_display()  
         self._build_filter()
         self._build_treeview()
+        self._build_progress()
+        if tracer.enabled:
+            self._build_status_bar()
 
         self._setup_bindings()
 
-        #dictionnary country -> items for the search bar
+        #dictionnary country -> item, used to update the rows of a country in place
         self.country_items = {}
+        # Formatted (values, tags) of every item, to skip unchanged rows
+        self.item_cells = {}
     
 
     def _setup_fonts(self):
@@ -64,6 +96,10 @@ class GUI:
         self.nb_of_numbers_col = 3
         self.country_col_width = 225
         self.numbers_col_width = 125
+        self.stats_col_width = 90
+
+        # Tables larger than this only create items for the rows in view
+        self.virtual_threshold = 2000
 
 
     def _build_form(self):
@@ -87,7 +123,20 @@ class GUI:
         self.file_entry.focus()
 
         self.open_button = ttk.Button(self.form_frame, text="Open", command=self.controller.on_open_clicked)
-        self.open_button.grid(row=0, column=2, padx=20)
+        self.open_button.grid(row=0, column=2, padx=(20, 5))
+
+        self.folder_button = ttk.Button(self.form_frame, text="Folder", command=self.controller.on_open_folder_clicked)
+        self.folder_button.grid(row=0, column=3)
+
+        # Reload the file in place when it changes on disk
+        self.watch_var = tk.BooleanVar(value=False)
+        self.watch_check = ttk.Checkbutton(
+            self.form_frame,
+            text="Watch",
+            variable=self.watch_var,
+            command=self.controller.on_watch_toggled
+            )
+        self.watch_check.grid(row=0, column=4, padx=5)
 
 
     def _build_indicator_section(self):
@@ -135,6 +184,14 @@ class GUI:
         self.search_var = tk.StringVar()
         self.selected_countries = []
 
+        self.search_countries = pd.Series([], dtype=object)
+        self.search_names = None
+        self.search_delay_ms = 150
+        self._search_after_id = None
+        # Treeview item of each displayed row, and positions of the rows currently shown
+        self.row_items = []
+        self.visible_rows = set()
+
         self.search_bar_frame = tk.Frame(self.root)
         self.search_bar_frame.pack(padx=10, pady=5, anchor='nw')        
 
@@ -143,7 +200,7 @@ class GUI:
         self.search_entry = tk.Entry(self.search_bar_frame, textvariable=self.search_var, width=20)
         self.search_entry.pack(padx=10)
 
-        # Trigger search on every text change
+        # Trigger a (debounced) search on every text change
         self.search_var.trace_add("write", self.on_search_change)
 
 
@@ -172,7 +229,37 @@ class GUI:
         filter_button.pack(side='left')
 
         self.clear_button = ttk.Button(self.filter_frame, text="Clear", command=self.controller.on_clear_clicked)
-        self.clear_button.pack(padx=10)
+        self.clear_button.pack(side='left', padx=10)
+
+        # Statistics columns, added to the right of the table when checked
+        self.columns_button = ttk.Menubutton(self.filter_frame, text="Columns")
+        self.columns_menu = tk.Menu(self.columns_button, tearoff=False)
+        self.statistics_vars = {}
+        for name in STATISTICS:
+            self.statistics_vars[name] = tk.BooleanVar(value=False)
+            self.columns_menu.add_checkbutton(
+                label=STATISTIC_HEADINGS[name],
+                variable=self.statistics_vars[name],
+                command=self.controller.on_statistics_changed
+                )
+        self.columns_button['menu'] = self.columns_menu
+        self.columns_button.pack(side='left')
+
+        self.correlation_button = ttk.Button(
+            self.filter_frame,
+            text="Correlations",
+            command=self.controller.on_correlation_clicked
+            )
+        self.correlation_button.pack(side='left', padx=10)
+        self.correlation_window = None
+
+        # Export the displayed table, or every indicator, in the background
+        self.export_button = ttk.Menubutton(self.filter_frame, text="Export")
+        self.export_menu = tk.Menu(self.export_button, tearoff=False)
+        self.export_menu.add_command(label="Displayed table...", command=self.controller.on_export_view_clicked)
+        self.export_menu.add_command(label="All indicators...", command=self.controller.on_export_all_clicked)
+        self.export_button['menu'] = self.export_menu
+        self.export_button.pack(side='left')
 
 
     def _build_treeview(self):
@@ -190,36 +277,113 @@ class GUI:
         self.scroll_bar = tk.Scrollbar(self.treeview_frame)
         self.scroll_bar.pack(side=tk.RIGHT, fill=tk.Y)
 
-        columns=['Country name', 'From', 'To', '% Change']
         self.treeview = ttk.Treeview(
             self.treeview_frame, 
             yscrollcommand=self.scroll_bar.set,
-            columns=columns,
             show='headings',
             selectmode="extended"
             )
         self.treeview.pack(fill="y", expand=True, side=tk.LEFT)
 
-    
+        self.base_columns = ['Country name', 'From', 'To', '% Change']
+        self._configure_columns([])
+
+        self.scroll_bar.config(command=self.treeview.yview)
+
+        self.virtual_table = VirtualTable(self.treeview, self.scroll_bar, self._format_row)
+        self.virtual_mode = False
+        self.displayed_df = None
+
+
+    def _configure_columns(self, statistics: list):
+        """Show the base columns followed by the given statistics columns, with sortable headers."""
+        self.displayed_statistics = list(statistics)
+        columns = self.base_columns + self.displayed_statistics
+        self.treeview['columns'] = columns
+
         for i, col in enumerate(columns):
             self.treeview.heading(
                 col, 
-                text=col, 
+                text=STATISTIC_HEADINGS.get(col, col), 
                 command=lambda 
                 i=i:self.controller.on_heading_clicked(i)
                 )
-            
 
         # Country column: wider, left-aligned
-        self.treeview.heading(columns[0], text=columns[0])
         self.treeview.column(columns[0], width=self.country_col_width, stretch=False)
 
         # Numeric columns: narrower, right-aligned
-        for col in columns[1:]:
-            self.treeview.heading(col, text=col)
+        for col in self.base_columns[1:]:
             self.treeview.column(col, anchor='e', width=self.numbers_col_width, stretch=False)
+        for col in self.displayed_statistics:
+            self.treeview.column(col, anchor='e', width=self.stats_col_width, stretch=False)
 
-        self.scroll_bar.config(command=self.treeview.yview)
+        # Number formats of the columns after the country name
+        self.column_formats = ["{:,.3f}"] * (len(self.base_columns) - 1) + [
+            "{:.0f}" if col in YEAR_STATISTICS else "{:,.3f}" for col in self.displayed_statistics
+            ]
+
+        # Let the window widen to fit the statistics columns
+        self.root.maxsize(700 + len(self.displayed_statistics)*self.stats_col_width, self.root.winfo_screenheight())
+
+
+    def _build_progress(self):
+        """Build the file loading progress bar and Cancel button (hidden until a load starts)."""
+        self.progress_frame = tk.Frame(self.root)
+
+        self.progress_bar = ttk.Progressbar(
+            self.progress_frame,
+            mode='determinate',
+            maximum=1.0,
+            length=self.country_col_width + self.nb_of_numbers_col*self.numbers_col_width - 100
+            )
+        self.progress_bar.pack(side='left')
+
+        self.cancel_button = ttk.Button(self.progress_frame, text="Cancel", command=self.controller.on_cancel_clicked)
+        self.cancel_button.pack(side='left', padx=10)
+
+
+    def _build_status_bar(self):
+        """Build the debug status bar showing the timing of the last handler (tracing only)."""
+        self.status_frame = tk.Frame(self.root)
+        self.status_frame.pack(side='bottom', fill='x', padx=10, pady=2, before=self.form_frame)
+
+        self.status_var = tk.StringVar(value="Tracing enabled")
+        tk.Label(self.status_frame, textvariable=self.status_var, font=self.font3, anchor='w').pack(
+            side='left', fill='x', expand=True
+            )
+        ttk.Button(self.status_frame, text="Export trace", command=self.export_trace).pack(side='right')
+
+        self._refresh_status_bar()
+
+
+    def _refresh_status_bar(self):
+        """Show the last top-level span and where its time went, then poll again."""
+        root_span, children = tracer.last_root_span()
+        if root_span is not None:
+            text = f"{root_span.name}: {root_span.duration*1000:.1f} ms"
+            if root_span.rows is not None:
+                text += f", {root_span.rows:,} rows"
+            if root_span.memory_delta is not None:
+                text += f", {root_span.memory_delta/1024**2:+.1f} MB"
+            if children:
+                text += "  |  " + ", ".join(
+                    f"{child.name.split('.')[-1]} {child.duration*1000:.1f} ms" for child in children
+                    )
+            self.status_var.set(text)
+
+        self.root.after(500, self._refresh_status_bar)
+
+
+    def export_trace(self):
+        """Ask for a file and export the recorded spans as a Chrome trace."""
+        filename = filedialog.asksaveasfilename(
+            title="Export trace",
+            defaultextension=".json",
+            filetypes=(("Chrome trace", "*.json"), ("all files", "*.*"))
+        )
+        if filename:
+            tracer.export_chrome_trace(filename)
 
 
     def _setup_bindings(self):
@@ -228,6 +392,11 @@ class GUI:
         self.treeview.bind("<Double-1>", lambda event: self.on_double_click(event))
         self.indicators_cb.bind("<<ComboboxSelected>>", self.controller.on_indicator_selected)
 
+        # In virtual mode the table scrolls by re-filling its items, not by moving them
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.treeview.bind(sequence, self._on_mousewheel)
+        self.treeview.bind("<Configure>", lambda event: self.virtual_mode and self.virtual_table.render())
+
     
     def on_double_click(self, event):
         """Handle double-click on treeview row to add country to 'Selected countries'."""
@@ -241,26 +410,91 @@ class GUI:
                 self.display_selected_countries()
 
 
+    def _on_mousewheel(self, event):
+        """Route mouse wheel scrolling to the virtual table when it is active."""
+        if self.virtual_mode:
+            return self.virtual_table.on_mousewheel(event)
+
+
     def on_search_change(self, *args):
-        """Filter treeview rows based on search query matching country names."""
+        """Schedule a search once typing pauses for search_delay_ms."""
+        if self._search_after_id is not None:
+            self.root.after_cancel(self._search_after_id)
+        self._search_after_id = self.root.after(self.search_delay_ms, self.apply_search)
+
+
+    @traced(rows=lambda gui, result: len(gui.search_countries))
+    def apply_search(self):
+        """
+        Filter treeview rows based on search query matching country names.
+        Only rows whose visibility changes are detached or reattached.
+        The displayed names are lower-cased on the first search after they changed.
+        """
+        self._search_after_id = None
+        if self.search_names is None:
+            self.search_names = pd.Index(self.search_countries.astype(str)).str.lower()
         query = self.search_var.get().lower()
+        matches = np.flatnonzero(self.search_names.str.contains(query, regex=False))
+
+        if self.virtual_mode:
+            # Only the rows in view exist as items: filter the row positions instead
+            self.virtual_table.set_positions(matches)
+            return
+
+        matches_set = set(matches.tolist())
+        hidden = self.visible_rows - matches_set
+        shown = sorted(matches_set - self.visible_rows)
+
+        if hidden:
+            self.treeview.detach(*[self.row_items[i] for i in hidden])
 
-        # Show matching countries, hide non-matching ones
-        for country, item_id in self.country_items.items():
-            if query.lower() in country.lower():
-                self.treeview.reattach(item_id, '', 'end')
-            else:
-                self.treeview.detach(item_id)
+        # Reattach in display order; each row goes after the visible rows before it
+        for i in shown:
+            index = int(np.searchsorted(matches, i))
+            self.treeview.reattach(self.row_items[i], '', index)
+
+        self.visible_rows = matches_set
+
+
+    def show_file_dialog(self, initial_dir) -> list:
+        """Open a file dialog to select one or more CSV files."""
+        filenames = filedialog.askopenfilenames(
+            initialdir=initial_dir,
+            title="Select CSV files",
+            filetypes=(("CSV files", "*.csv*"), ("Prepared datasets", "meta.json"), ("all files","*.*"))
+        )
+        return list(filenames)
 
 
-    def show_file_dialog(self, initial_dir):
-        """Open a file dialog to select a CSV file."""
-        filename = filedialog.askopenfilename(
+    def show_export_dialog(self, initial_dir) -> str:
+        """Open a save dialog to choose the export file; its extension selects the format."""
+        return filedialog.asksaveasfilename(
             initialdir=initial_dir,
-            title="Select a CSV file",
-            filetypes=(("CSV files", "*.csv*"), ("all files","*.*"))
+            title="Export",
+            defaultextension=".csv",
+            filetypes=(("CSV files", "*.csv"), ("Parquet files", "*.parquet"), ("JSON Lines", "*.jsonl"))
         )
-        return filename 
+
+
+    def show_folder_dialog(self, initial_dir) -> str:
+        """Open a dialog to select a directory of CSV files."""
+        return filedialog.askdirectory(initialdir=initial_dir, title="Select a folder of CSV files")
+
+
+    def show_progress(self):
+        """Show the progress bar and Cancel button above the table, reset to 0."""
+        self.progress_bar['value'] = 0
+        self.progress_frame.pack(padx=20, anchor='nw', before=self.treeview_frame)
+
+
+    def update_progress(self, fraction: float):
+        """Update the progress bar with the fraction of the file loaded (or exported)."""
+        self.progress_bar['value'] = fraction
+
+
+    def hide_progress(self):
+        """Hide the progress bar and Cancel button."""
+        self.progress_frame.pack_forget()
 
 
     def display_path_file(self, path: str):
@@ -280,6 +514,34 @@ class GUI:
         self.indicators_ttp = ToolTip(self.indicators_cb, self.indicators_cb.get())
 
 
+    def update_indicators(self, indicators: list[str]):
+        """Replace the indicators of the dropdown, keeping the selected one if it still exists."""
+        selected = self.indicators_cb.get()
+        self.indicators_cb['values'] = indicators
+
+        if selected not in indicators:
+            self.indicators_cb.current(0)
+            self.indicators_ttp.text = self.indicators_cb.get()
+
+
+    def update_year_bounds(self, min_year: int, max_year: int, start_year: int, end_year: int):
+        """Change the bounds of the year spinboxes and show the given range, without resetting their command."""
+        for spinbox in (self.start_year_spinbox, self.end_year_spinbox):
+            spinbox.config(from_=min_year, to=max_year)
+        self.start_year_var.set(start_year)
+        self.end_year_var.set(end_year)
+
+
+    def watch_enabled(self) -> bool:
+        """Return whether the "Watch" box is checked."""
+        return self.watch_var.get()
+
+
+    def set_watch_enabled(self, enabled: bool):
+        """Check or uncheck the "Watch" box."""
+        self.watch_var.set(enabled)
+
+
     def display_years(self, min_year: int, max_year: int):
         """
         Configure year spinboxes with available year range and default values.
@@ -313,30 +575,120 @@ class GUI:
             self.selected_countries_label_var.set(f"{current_label} '{new_country}'")
     
 
+    @traced(rows=lambda gui, result: len(gui.displayed_df))
     def display_datas(self, country_col: str, df):
-        """Populate treeview with data from DataFrame, format numbers, apply styling."""
-        self.treeview.delete(*self.treeview.get_children())
-        self.country_items.clear()
+        """
+        Populate treeview with data from DataFrame, format numbers, apply styling.
+        Existing rows are reconciled with the new frame by country, so a sort only
+        moves items and a recomputation only rewrites the cells that changed.
+        Frames larger than virtual_threshold are rendered virtually: only the rows
+        in view exist as items and scrolling pages rows in from the frame.
+        """
+        self.displayed_df = df
+
+        statistics = list(df.columns[len(self.base_columns):])
+        if statistics != self.displayed_statistics:
+            self._configure_columns(statistics)
 
         # Configure row colors for alternating rows and negative values
         self.treeview.tag_configure("negative", foreground="#cc2c2c")
         self.treeview.tag_configure('pair', background="#e1dede")
         self.treeview.tag_configure('impair', background='white')
 
-        for i, (_,row) in enumerate(df.iterrows()):
-            values = list(row)
-            tags = ["pair"] if i%2==0 else ["impair"]
+        self.search_countries = df[country_col]
+        self.search_names = None
+
+        if len(df) > self.virtual_threshold:
+            self._delete_items()
+            self._set_virtual_mode(True)
+            self.virtual_table.set_rows(df)
+        else:
+            self.virtual_table.clear()
+            self._set_virtual_mode(False)
+            self._reconcile_items(country_col, df)
 
-            # Colors row's font in red if delta is negative
-            if(values[-1]<0):
-                tags.append('negative')
-            
-            # Format numbers with comma separators and 3 decimal places
-            values[1:] = [f"{n:,.3f}" for n in values[1:]]
-            item_id = self.treeview.insert('', 'end', values=values, tags=tags)
+        # Keep the current search applied to the new rows
+        if self.search_var.get():
+            self.apply_search()
 
-            # Store mapping for search functionality
-            self.country_items[row[country_col].lower()] = item_id
+
+    def _reconcile_items(self, country_col: str, df):
+        """
+        Make the treeview items match the rows of df, keyed by country: rows of
+        countries no longer shown are deleted, new countries are inserted, and
+        existing items are only updated when their formatted cells differ.
+        """
+        country_index = df.columns.get_loc(country_col)
+        rows = list(df.itertuples(index=False))
+        countries = {row[country_index] for row in rows}
+
+        stale = [item_id for country, item_id in self.country_items.items() if country not in countries]
+        if stale:
+            self.treeview.delete(*stale)
+            for item_id in stale:
+                del self.item_cells[item_id]
+        self.country_items = {
+            country: item_id for country, item_id in self.country_items.items() if country in countries
+            }
+
+        previous_items = self.row_items
+        all_shown = len(self.visible_rows) == len(previous_items)
+        self.row_items = []
+
+        for i, row in enumerate(rows):
+            values, tags = self._format_row(i, row)
+            cells = (values, tags)
+            item_id = self.country_items.get(row[country_index])
+
+            if item_id is None:
+                item_id = self.treeview.insert('', 'end', values=values, tags=tags)
+                self.country_items[row[country_index]] = item_id
+            elif self.item_cells[item_id] != cells:
+                self.treeview.item(item_id, values=values, tags=tags)
+
+            self.item_cells[item_id] = cells
+            self.row_items.append(item_id)
+
+        # One call moves every item to its new position and reattaches rows hidden by a search
+        if self.row_items != previous_items or not all_shown:
+            self.treeview.set_children('', *self.row_items)
+        self.visible_rows = set(range(len(self.row_items)))
+
+
+    def _delete_items(self):
+        """Delete the items created outside of the virtual table."""
+        if self.country_items:
+            self.treeview.delete(*self.country_items.values())
+        self.country_items = {}
+        self.item_cells = {}
+        self.row_items = []
+        self.visible_rows = set()
+
+
+    def _format_row(self, i: int, row) -> tuple:
+        """Return the display values and tags of the i-th row."""
+        values = list(row)
+        tags = ["pair"] if i%2==0 else ["impair"]
+
+        # Colors row's font in red if delta is negative
+        if(values[len(self.base_columns) - 1]<0):
+            tags.append('negative')
+        
+        # Format numbers with comma separators and 3 decimal places (years without decimals)
+        values[1:] = [number_format.format(n) for number_format, n in zip(self.column_formats, values[1:])]
+        return values, tags
+
+
+    def _set_virtual_mode(self, enabled: bool):
+        """Switch the scrollbar between native Treeview scrolling and the virtual table."""
+        self.virtual_mode = enabled
+
+        if enabled:
+            self.scroll_bar.config(command=self.virtual_table.yview)
+            self.treeview.config(yscrollcommand='')
+        else:
+            self.scroll_bar.config(command=self.treeview.yview)
+            self.treeview.config(yscrollcommand=self.scroll_bar.set)
         
 
     def show_error(self, error_msg: str):
@@ -344,6 +696,11 @@ class GUI:
         messagebox.showinfo(self.root.title, error_msg)
 
 
+    def show_info(self, message: str):
+        """Display an information message in a messagebox."""
+        messagebox.showinfo(self.root.title(), message)
+
+
     def get_selected_countries(self) -> list[str]:
         """Return list of countries selected for filtering."""     
         return self.selected_countries
@@ -354,6 +711,28 @@ class GUI:
         self.indicators_ttp.text = indicator
 
 
+    def show_correlations(self, df, start_year, end_year):
+        """Display the correlation matrix df, opening its window if needed."""
+        if not self.correlations_shown():
+            self.correlation_window = CorrelationWindow(self.root, self.controller)
+        self.correlation_window.display(df, start_year, end_year)
+
+
+    def correlations_shown(self) -> bool:
+        """Return whether the correlation window is open."""
+        return self.correlation_window is not None and self.correlation_window.is_open()
+
+
+    def get_correlation_mode(self) -> str:
+        """Return the correlation mode selected in the correlation window."""
+        return self.correlation_window.get_mode()
+
+
+    def get_selected_statistics(self) -> list[str]:
+        """Return the statistics checked in the "Columns" menu, in display order."""
+        return [name for name in STATISTICS if self.statistics_vars[name].get()]
+
+
     def clear_selection(self, event=None):
         """Clear all selected countries and update display."""
         self.selected_countries = []
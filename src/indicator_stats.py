@@ -0,0 +1,72 @@
+import numpy as np
+
+# Statistics computed by compute_statistics, in display order
+STATISTICS = ('mean', 'cagr', 'volatility', 'min', 'min_year', 'max', 'max_year', 'zscore')
+
+
+def compute_statistics(tables, start_pos: int, end_pos: int, names=STATISTICS, rows=slice(None)) -> dict:
+    """
+    Compute the statistics names (by default all of STATISTICS) for the countries
+    of an indicator over the year positions start_pos to end_pos (both included).
+    rows selects the countries (positions in the indicator block); only those
+    are computed, but z-scores are still taken against all countries.
+    tables is the RangeTables of the indicator block: each statistic is one
+    array over the countries, read from prefix sums and sparse tables in
+    constant time per country whatever the length of the range.
+
+    - mean: mean of the values of the range
+    - cagr: compound annual growth rate between the start and end years, in %
+    - volatility: standard deviation of the year-over-year changes, in %
+    - min, max: lowest and highest value of the range
+    - min_year, max_year: first year the lowest and highest values are reached
+    - zscore: distance of the country's % change to the mean of all countries,
+      in standard deviations
+
+    Missing values are skipped; a statistic that cannot be computed is NaN.
+    Values are rounded to 3 decimals, as deltas are.
+    """
+    start_values, end_values = tables.values[:, start_pos], tables.values[:, end_pos]
+    statistics = {}
+
+    for name in names:
+        if name == 'mean':
+            column = tables.mean(start_pos, end_pos, rows)
+        elif name == 'cagr':
+            column = _cagr(start_values[rows], end_values[rows], end_pos - start_pos)
+        elif name == 'volatility':
+            column = tables.volatility(start_pos, end_pos, rows)
+        elif name in ('min', 'min_year'):
+            column = tables.minimum(start_pos, end_pos, rows)[name == 'min_year']
+        elif name in ('max', 'max_year'):
+            column = tables.maximum(start_pos, end_pos, rows)[name == 'max_year']
+        elif name == 'zscore':
+            column = _zscore(percent_change(start_values, end_values))[rows]
+        else:
+            raise ValueError(f"Unknown statistic: '{name}'. Use one of {', '.join(STATISTICS)}.")
+
+        statistics[name] = np.round(column, 3)
+
+    return statistics
+
+
+def percent_change(start_values: np.ndarray, end_values: np.ndarray) -> np.ndarray:
+    """Percentage change from start to end values, NaN where the start value is 0."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        change = ((end_values - start_values) / start_values) * 100
+    return np.where(start_values == 0, np.nan, change)
+
+
+def _cagr(start_values: np.ndarray, end_values: np.ndarray, periods: int) -> np.ndarray:
+    """Compound annual growth rate in %, NaN unless both values are positive."""
+    valid = (start_values > 0) & (end_values > 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = np.where(valid, end_values / np.where(valid, start_values, 1), np.nan)
+        return (ratio ** (1 / periods) - 1) * 100
+
+
+def _zscore(column: np.ndarray) -> np.ndarray:
+    """Standard score of each value against all the non-missing values of column."""
+    present = column[~np.isnan(column)]
+    if len(present) == 0 or not present.std() > 0:
+        return np.full(len(column), np.nan)
+    return (column - present.mean()) / present.std()
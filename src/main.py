@@ -1,17 +1,124 @@
-from data_handler import DataHandler
-from gui import GUI
-from controller import AppController
+import argparse
+import os
+import sys
+
+from data_handler import DataHandler, InvalidFileFormatError
+from dataset import MERGE_CONFLICT_RULES
+from instrumentation import instrumented_session
+from sidecar_cache import SidecarCache
+
+
+def sidecar_cache():
+   """The sidecar cache of the GUI and the server, unless SAT_NO_CACHE=1 disables it."""
+   if os.environ.get('SAT_NO_CACHE'):
+      return None
+   return SidecarCache()
+
+
+def run_gui():
+   # Imported here so that headless commands never load tkinter
+   from gui import GUI
+   from controller import AppController
+
+   data_handler = DataHandler(sidecar_cache=sidecar_cache())
+   controller = AppController(data_handler)
+   gui = GUI(controller)
+   
+   controller.set_gui(gui)
+   gui.run()
+
+
+def run_batch_command(args):
+   from batch import parse_year_range, run_batch
+
+   year_ranges = [parse_year_range(text) for text in args.years] if args.years else None
+   rows = run_batch(
+      args.csv,
+      args.output,
+      indicator_patterns=args.indicators,
+      year_ranges=year_ranges,
+      workers=args.workers,
+      use_cache=not args.no_cache,
+      conflict=args.conflict
+      )
+   print(f"Wrote {rows} rows to {args.output}")
+
+
+def run_prepare_command(args):
+   DataHandler().prepare_dataset(args.csv, args.output)
+   print(f"Prepared dataset written to {args.output}")
+
+
+def run_serve_command(args):
+   from server import QueryServer
+
+   data_handler = DataHandler(cache_size=args.cache_size, sidecar_cache=sidecar_cache())
+   data_handler.load_files(args.csv, args.conflict)
+
+   server = QueryServer(data_handler, args.host, args.port)
+   host, port = server.server_address[:2]
+   print(f"Serving {len(data_handler.get_indicators())} indicators on http://{host}:{port} (Ctrl+C to stop)")
+   try:
+      server.serve_forever()
+   except KeyboardInterrupt:
+      pass
+   finally:
+      server.server_close()
+
+
+def build_parser() -> argparse.ArgumentParser:
+   parser = argparse.ArgumentParser(
+      description="Statistical Analysis Tool. Starts the GUI when no command is given."
+      )
+   commands = parser.add_subparsers(dest='command')
+
+   batch = commands.add_parser('batch', help="compute deltas headlessly and write them to a file")
+   batch.add_argument('csv', nargs='+',
+                      help="input CSV files, directories of CSV files or prepared dataset directories")
+   batch.add_argument('-o', '--output', required=True, help="output file (.csv, .parquet or .jsonl)")
+   batch.add_argument('-i', '--indicators', nargs='+', metavar='PATTERN',
+                      help="indicator names or glob patterns (default: all)")
+   batch.add_argument('-y', '--years', nargs='+', metavar='START-END',
+                      help="year ranges, e.g. 2017-2020 (default: full range)")
+   batch.add_argument('-w', '--workers', type=int, help="number of worker processes (default: CPU count)")
+   batch.add_argument('--no-cache', action='store_true', help="do not read or write the sidecar cache")
+   batch.add_argument('--conflict', choices=MERGE_CONFLICT_RULES, default='last',
+                      help="value kept when several files have the same cell (default: last file)")
+
+   prepare = commands.add_parser('prepare', help="convert a CSV file to a memory-mapped dataset directory")
+   prepare.add_argument('csv', help="input CSV file")
+   prepare.add_argument('-o', '--output', required=True, help="output directory")
+
+   serve = commands.add_parser('serve', help="answer JSON queries over HTTP on the local machine")
+   serve.add_argument('csv', nargs='+',
+                      help="input CSV files, directories of CSV files or prepared dataset directories")
+   serve.add_argument('--host', default='127.0.0.1', help="loopback interface to listen on (default: 127.0.0.1)")
+   serve.add_argument('-p', '--port', type=int, default=8765, help="port to listen on (default: 8765)")
+   serve.add_argument('--cache-size', type=int, default=1024, help="number of query results cached (default: 1024)")
+   serve.add_argument('--conflict', choices=MERGE_CONFLICT_RULES, default='last',
+                      help="value kept when several files have the same cell (default: last file)")
+
+   return parser
 
 
 def main():
+   args = build_parser().parse_args()
+
    try:
-      data_handler = DataHandler()
-      controller = AppController(data_handler)
-      gui = GUI(controller)
-      
-      controller.set_gui(gui)
-      gui.run()
+      with instrumented_session():
+         if args.command == 'batch':
+            run_batch_command(args)
+         elif args.command == 'prepare':
+            run_prepare_command(args)
+         elif args.command == 'serve':
+            run_serve_command(args)
+         else:
+            run_gui()
+
 
+   except (InvalidFileFormatError, ValueError, OSError) as e:
+      print("Error: ", e)
+      sys.exit(1)
 
    except Exception as e:
       print("Error: ", e)
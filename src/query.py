@@ -0,0 +1,14 @@
+from collections import namedtuple
+
+# A complete description of a result table, evaluated by DataHandler.run_query.
+# Being immutable and hashable, equal queries are recognized as the same query.
+# - indicator, start_year, end_year: what is computed, years as strings
+# - countries: frozenset of the countries to keep (empty keeps every country)
+# - statistics: tuple of indicator_stats.STATISTICS names added as columns
+# - sort_col: index of the column the rows are sorted by, or None
+# - ascending: direction of the sort
+Query = namedtuple(
+    'Query',
+    ['indicator', 'start_year', 'end_year', 'countries', 'statistics', 'sort_col', 'ascending'],
+    defaults=(frozenset(), (), None, True)
+    )
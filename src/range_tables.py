@@ -0,0 +1,124 @@
+import numpy as np
+
+from indicator_stats import percent_change
+
+
+class RangeTables:
+    """
+    Precomputed structures over the year axis of one indicator block, answering
+    any (start, end) year range aggregate in constant time per country.
+
+    Responsible for:
+    - Prefix sums of values and counts of non-missing values, for range means
+    - Prefix sums of year-over-year changes and of their squares, for volatility
+    - Sparse tables of the positions of range minimums and maximums
+
+    Year positions are inclusive on both ends, like the years a user selects.
+    Every query takes an optional rows selection, to answer for some countries only.
+    A range aggregate is the difference of two prefix columns, or the better of
+    two overlapping power-of-two windows of a sparse table, whatever its length.
+
+    Args:
+        values (np.ndarray): Year values of the indicator, shape (countries, years)
+        years (pd.Index): Year column names of the dataset
+
+    Attributes:
+        values (np.ndarray): Year values as a float block
+        years (np.ndarray): Years as floats, indexed by position
+    """
+
+    def __init__(self, values, years):
+        self.values = np.asarray(values, dtype=float)
+        self.years = np.asarray(years, dtype=float)
+
+        present = ~np.isnan(self.values)
+        self._counts = self._prefix(present)
+        self._sums = self._prefix(np.where(present, self.values, 0))
+
+        # Change from year i to year i + 1 is stored at position i
+        changes = percent_change(self.values[:, :-1], self.values[:, 1:])
+        changes_present = ~np.isnan(changes)
+        # Sums of squares are taken around each country's mean change to limit cancellation
+        with np.errstate(divide='ignore', invalid='ignore'):
+            shift = np.where(changes_present, changes, 0).sum(axis=1) / changes_present.sum(axis=1)
+        changes = np.where(changes_present, changes - np.nan_to_num(shift)[:, None], 0)
+        self._change_counts = self._prefix(changes_present)
+        self._change_sums = self._prefix(changes)
+        self._change_squares = self._prefix(changes ** 2)
+
+        # Missing values never win a comparison
+        self._min_table = self._sparse_table(np.where(present, self.values, np.inf), np.less_equal)
+        self._max_table = self._sparse_table(np.where(present, self.values, -np.inf), np.greater_equal)
+
+
+    def mean(self, start: int, end: int, rows=slice(None)) -> np.ndarray:
+        """Mean of the non-missing values between positions start and end."""
+        count = self._counts[rows, end + 1] - self._counts[rows, start]
+        total = self._sums[rows, end + 1] - self._sums[rows, start]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(count > 0, total / count, np.nan)
+
+
+    def volatility(self, start: int, end: int, rows=slice(None)) -> np.ndarray:
+        """Sample standard deviation of the year-over-year changes between positions start and end."""
+        # Changes inside the range are those from start to end - 1
+        count = self._change_counts[rows, end] - self._change_counts[rows, start]
+        total = self._change_sums[rows, end] - self._change_sums[rows, start]
+        squares = self._change_squares[rows, end] - self._change_squares[rows, start]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            variance = (squares - total ** 2 / count) / (count - 1)
+            return np.where(count > 1, np.sqrt(np.maximum(variance, 0)), np.nan)
+
+
+    def minimum(self, start: int, end: int, rows=slice(None)) -> tuple:
+        """Lowest value between positions start and end and the first year it is reached."""
+        return self._query(self._min_table, np.less_equal, start, end, rows)
+
+
+    def maximum(self, start: int, end: int, rows=slice(None)) -> tuple:
+        """Highest value between positions start and end and the first year it is reached."""
+        return self._query(self._max_table, np.greater_equal, start, end, rows)
+
+
+    def _query(self, table: tuple, better, start: int, end: int, rows) -> tuple:
+        keys, levels = table
+        level = int(end - start + 1).bit_length() - 1
+
+        # Two windows of 2**level years cover the range; ties go to the earlier one
+        left = levels[level][rows, start]
+        right = levels[level][rows, end - (1 << level) + 1]
+        rows = np.arange(len(keys))[rows]
+        positions = np.where(better(keys[rows, left], keys[rows, right]), left, right)
+
+        extremes = self.values[rows, positions]
+        missing = np.isnan(extremes)
+        return extremes, np.where(missing, np.nan, self.years[positions])
+
+
+    @staticmethod
+    def _prefix(block: np.ndarray) -> np.ndarray:
+        """Row-wise prefix sums with a leading zero column: sum of [i, j) is p[j] - p[i]."""
+        prefix = np.zeros((block.shape[0], block.shape[1] + 1))
+        np.cumsum(block, axis=1, out=prefix[:, 1:])
+        return prefix
+
+
+    @staticmethod
+    def _sparse_table(keys: np.ndarray, better) -> tuple:
+        """
+        Level k holds, for each start position, the position of the best key of
+        the 2**k positions from there. Returns (keys, levels).
+        """
+        n_years = keys.shape[1]
+        rows = np.arange(len(keys))[:, None]
+        levels = [np.broadcast_to(np.arange(n_years, dtype=np.int32), keys.shape)]
+
+        width = 1
+        while 2 * width <= n_years:
+            previous = levels[-1]
+            left = previous[:, :n_years - 2 * width + 1]
+            right = previous[:, width:n_years - width + 1]
+            levels.append(np.where(better(keys[rows, left], keys[rows, right]), left, right))
+            width *= 2
+
+        return keys, levels
@@ -0,0 +1,106 @@
+from background import BackgroundTask
+
+
+class RecomputeScheduler:
+    """
+    Coalesces rapid requests into one computation on a worker thread and only
+    ever delivers the result of the latest request.
+
+    Responsible for:
+    - Waiting for requests to pause for a short delay before computing
+    - Running the computation off the Tk thread with a BackgroundTask
+    - Cancelling the computation of a request that became stale
+    - Discarding any result whose generation is not the latest one
+
+    Every request increments a generation counter. A result is delivered only
+    if its generation is still the latest when it reaches the Tk thread, so a
+    stale computation that could not be stopped in time is simply dropped.
+
+    Args:
+        root: Tk widget used to schedule the delays and the polling
+        compute (callable): Called as compute(state) on the worker thread
+        on_result (callable): Called as on_result(state, result) on the Tk thread
+        on_error (callable): Called with the exception raised by compute on the Tk thread
+        delay_ms (int): Pause in requests after which the latest one is computed (default 100)
+
+    Attributes:
+        generation (int): Number of the latest request
+        pending_state: State of the latest request not delivered yet, or None
+        task (BackgroundTask): Computation in flight, or None
+    """
+
+    def __init__(self, root, compute, on_result, on_error, delay_ms=100):
+        self.root = root
+        self.compute = compute
+        self.on_result = on_result
+        self.on_error = on_error
+        self.delay_ms = delay_ms
+
+        self.generation = 0
+        self.pending_state = None
+        self.task = None
+
+        self._after_id = None
+
+
+    def request(self, state, delay_ms: int = None):
+        """
+        Ask for state to be computed once requests pause for delay_ms
+        (delay_ms by default). Supersedes every earlier request.
+        """
+        self.generation += 1
+        self.pending_state = state
+
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+        delay_ms = self.delay_ms if delay_ms is None else delay_ms
+        self._after_id = self.root.after(delay_ms, self._launch, self.generation)
+
+
+    def cancel(self):
+        """Drop the pending request and stop the computation in flight."""
+        self.generation += 1
+        self.pending_state = None
+
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        self._cancel_task()
+
+
+    def _launch(self, generation: int):
+        """Start computing the latest request, cancelling the one in flight."""
+        self._after_id = None
+        self._cancel_task()
+
+        state = self.pending_state
+        self.task = BackgroundTask(
+            self.root,
+            lambda progress, cancel_event: self.compute(state),
+            on_done=lambda result: self._deliver(generation, state, result),
+            on_error=lambda error: self._fail(generation, error),
+            poll_ms=15
+            )
+        self.task.start()
+
+
+    def _deliver(self, generation: int, state, result):
+        if generation != self.generation:
+            return
+        self.task = None
+        self.pending_state = None
+        self.on_result(state, result)
+
+
+    def _fail(self, generation: int, error: Exception):
+        if generation != self.generation:
+            return
+        self.task = None
+        self.pending_state = None
+        self.on_error(error)
+
+
+    def _cancel_task(self):
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
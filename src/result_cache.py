@@ -0,0 +1,73 @@
+import threading
+from collections import OrderedDict, namedtuple
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+class ResultCache:
+    """
+    Bounded memoization store with least-recently-used eviction.
+
+    Responsible for:
+    - Keeping computed query results keyed by any hashable key
+    - Evicting the least recently used entry once the size bound is reached
+    - Counting hits and misses to check the cache helps in practice
+    - Staying consistent when used from several threads
+
+    Args:
+        maxsize (int): Maximum number of entries kept (0 disables caching)
+
+    Attributes:
+        maxsize (int): Maximum number of entries kept
+        hits (int): Number of lookups answered from the cache
+        misses (int): Number of lookups that found no entry
+    """
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+
+    def get(self, key, default=None):
+        """Return the cached value for key and mark it as most recently used."""
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return default
+
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+
+    def put(self, key, value):
+        """Store value under key, evicting the least recently used entry if full."""
+        if self.maxsize <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+    def clear(self):
+        """Drop every entry. Hit/miss counters are kept."""
+        with self._lock:
+            self._entries.clear()
+
+
+    def info(self) -> CacheInfo:
+        """Return hit/miss counters and current size."""
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,290 @@
+import ipaddress
+import json
+import math
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from data_handler import DataHandler
+from indicator_stats import STATISTICS
+from query import Query
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+# Latencies kept per endpoint to compute percentiles
+LATENCY_SAMPLES = 1000
+
+
+class LatencyMetrics:
+    """
+    Request counts and latencies per endpoint, safe to update from many threads.
+
+    Args:
+        samples (int): Number of recent latencies kept per endpoint for percentiles
+
+    Attributes:
+        started (float): Time the metrics started, as time.time()
+    """
+
+    def __init__(self, samples: int = LATENCY_SAMPLES):
+        self.samples = samples
+        self.started = time.time()
+
+        self._lock = threading.Lock()
+        self._endpoints = {}
+
+
+    def record(self, endpoint: str, seconds: float, error: bool = False):
+        """Record one request of endpoint that took seconds."""
+        with self._lock:
+            stats = self._endpoints.get(endpoint)
+            if stats is None:
+                stats = self._endpoints[endpoint] = {
+                    'count': 0, 'errors': 0, 'total': 0.0, 'max': 0.0, 'recent': deque(maxlen=self.samples)
+                    }
+            stats['count'] += 1
+            stats['errors'] += error
+            stats['total'] += seconds
+            stats['max'] = max(stats['max'], seconds)
+            stats['recent'].append(seconds)
+
+
+    def snapshot(self) -> dict:
+        """Return the metrics of every endpoint, latencies in milliseconds."""
+        with self._lock:
+            endpoints = {name: dict(stats, recent=sorted(stats['recent'])) for name, stats in self._endpoints.items()}
+
+        report = {}
+        for name, stats in endpoints.items():
+            recent = stats['recent']
+            report[name] = {
+                'requests': stats['count'],
+                'errors': stats['errors'],
+                'mean_ms': round(stats['total'] / stats['count'] * 1000, 3),
+                'p50_ms': round(_percentile(recent, 0.50) * 1000, 3),
+                'p95_ms': round(_percentile(recent, 0.95) * 1000, 3),
+                'p99_ms': round(_percentile(recent, 0.99) * 1000, 3),
+                'max_ms': round(stats['max'] * 1000, 3),
+                }
+        return {'uptime_s': round(time.time() - self.started, 3), 'endpoints': report}
+
+
+def _is_loopback(host: str) -> bool:
+    """Return True if host is 'localhost' or a loopback address."""
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+class QueryServer(ThreadingHTTPServer):
+    """
+    HTTP server answering JSON queries on a loaded dataset, one thread per request.
+
+    Responsible for:
+    - Sharing one read-only dataset between every request thread
+    - Answering the same queries as the GUI through DataHandler.run_query,
+      whose result cache is shared by all clients
+    - Recording the latency of every request
+
+    The dataset is an immutable snapshot taken when the server starts, so
+    requests never need a lock to read it; the result cache has its own lock.
+
+    Endpoints (GET, parameters in the query string; POST /deltas also accepts a JSON body):
+    - /indicators: the indicator names
+    - /years: the first and last years and every year column
+    - /deltas?indicator=...&start=YYYY&end=YYYY: the delta table of an indicator,
+      optionally with country=... (repeatable), statistics=...
+      (comma separated), sort=<column> and order=asc|desc
+    - /metrics: request counts, latency percentiles and result cache statistics
+
+    Args:
+        data_handler (DataHandler): Handler with the dataset already loaded
+        host (str): Loopback interface to listen on (127.0.0.1 by default)
+        port (int): Port to listen on (0 picks a free port)
+
+    Attributes:
+        data_handler (DataHandler): Handler answering the queries
+        dataset (Dataset): Snapshot served by every request
+        metrics (LatencyMetrics): Request latencies per endpoint
+    """
+
+    daemon_threads = True
+
+    def __init__(self, data_handler: DataHandler, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+        # The server has no authentication: it must not be reachable from other machines
+        if not _is_loopback(host):
+            raise ValueError(f"Invalid host: '{host}'. The server only listens on a loopback interface.")
+
+        self.data_handler = data_handler
+        self.dataset = data_handler.dataset
+        self.metrics = LatencyMetrics()
+        super().__init__((host, port), _RequestHandler)
+
+
+    def get_indicators(self, params: dict) -> dict:
+        return {'indicators': self.dataset.get_indicators()}
+
+
+    def get_years(self, params: dict) -> dict:
+        years = list(self.dataset.get_years_columns())
+        return {'first_year': int(years[0]), 'last_year': int(years[-1]), 'years': years}
+
+
+    def get_deltas(self, params: dict) -> dict:
+        query = self._build_query(params)
+        result_df = self.data_handler.run_query(query, dataset=self.dataset)
+
+        return {
+            'indicator': query.indicator,
+            'start_year': query.start_year,
+            'end_year': query.end_year,
+            'columns': list(result_df.columns),
+            'rows': [[_json_number(value) for value in row] for row in result_df.itertuples(index=False)],
+            }
+
+
+    def get_metrics(self, params: dict) -> dict:
+        report = self.metrics.snapshot()
+        report['cache'] = self.data_handler.cache_info()._asdict()
+        return report
+
+
+    def _build_query(self, params: dict) -> Query:
+        """Build the Query of a /deltas request. Raises ValueError on invalid parameters."""
+        indicator = _single(params, 'indicator')
+        if indicator is None or self.dataset.indicator_code(indicator) < 0:
+            raise ValueError(f"Unknown indicator: '{indicator}'.")
+
+        years = self.dataset.get_years_columns()
+        start_year = _single(params, 'start') or years[0]
+        end_year = _single(params, 'end') or years[-1]
+        for year in (start_year, end_year):
+            if year not in years:
+                raise ValueError(f"Year must be between {years[0]} and {years[-1]}.")
+        if not int(start_year) < int(end_year):
+            raise ValueError("Invalid year range: the start year must be less than the end year.")
+
+        statistics = tuple(_multiple(params, 'statistics'))
+        unknown = [name for name in statistics if name not in STATISTICS]
+        if unknown:
+            raise ValueError(f"Unknown statistics: {', '.join(unknown)}. Use some of {', '.join(STATISTICS)}.")
+
+        columns = [self.data_handler.get_country_col(), start_year, end_year, 'delta', *statistics]
+        sort = _single(params, 'sort')
+        if sort is not None and sort not in columns:
+            raise ValueError(f"Unknown sort column: '{sort}'. Use one of {', '.join(columns)}.")
+
+        order = _single(params, 'order') or 'asc'
+        if order not in ('asc', 'desc'):
+            raise ValueError("order must be 'asc' or 'desc'.")
+
+        return Query(
+            indicator,
+            start_year,
+            end_year,
+            # Country names may contain commas: they are never split
+            countries=frozenset(_multiple(params, 'country', split=False)),
+            statistics=statistics,
+            sort_col=None if sort is None else columns.index(sort),
+            ascending=order == 'asc'
+            )
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """Routes requests to the QueryServer and writes JSON responses."""
+
+    routes = {
+        '/indicators': QueryServer.get_indicators,
+        '/years': QueryServer.get_years,
+        '/deltas': QueryServer.get_deltas,
+        '/metrics': QueryServer.get_metrics,
+        }
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        self._answer(url.path, parse_qs(url.query))
+
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        params = parse_qs(url.query)
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            try:
+                body = json.loads(self.rfile.read(length))
+                if not isinstance(body, dict):
+                    raise ValueError
+            except ValueError:
+                self._send(400, {'error': "The request body must be a JSON object."})
+                return
+            params.update({key: value if isinstance(value, list) else [value] for key, value in body.items()})
+        self._answer(url.path, params)
+
+
+    def _answer(self, path: str, params: dict):
+        start = time.perf_counter()
+        route = self.routes.get(path)
+        status = 200
+
+        if route is None:
+            status, body = 404, {'error': f"Unknown endpoint: '{path}'. Use one of {', '.join(self.routes)}."}
+        else:
+            try:
+                body = route(self.server, params)
+            except ValueError as e:
+                status, body = 400, {'error': str(e)}
+            except Exception as e:
+                status, body = 500, {'error': str(e)}
+
+        self._send(status, body)
+        self.server.metrics.record(path if route is not None else 'unknown', time.perf_counter() - start, status != 200)
+
+
+    def _send(self, status: int, body: dict):
+        payload = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+    def log_message(self, format, *args):
+        # Requests are counted in the metrics instead of logged one by one
+        pass
+
+
+def _single(params: dict, name: str):
+    """Last value of a parameter as a string, or None."""
+    values = params.get(name)
+    return str(values[-1]) if values else None
+
+
+def _multiple(params: dict, name: str, split: bool = True) -> list:
+    """Every value of a repeatable parameter; with split, comma separated strings are split too."""
+    values = []
+    for value in params.get(name, []):
+        parts = str(value).split(',') if split else [str(value)]
+        values.extend(part.strip() for part in parts if part.strip())
+    return values
+
+
+def _json_number(value):
+    """Make a table value JSON serializable: NaN becomes null, numpy scalars plain numbers."""
+    if hasattr(value, 'item'):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def _percentile(sorted_values: list, fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
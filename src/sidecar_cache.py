@@ -0,0 +1,115 @@
+import hashlib
+import os
+import shutil
+import tempfile
+
+from dataset import Dataset
+from dataset_store import META_FILE, load_dataset, save_dataset
+
+
+def default_cache_dir() -> str:
+    """Return the per-user directory where sidecars are stored."""
+    base = os.environ.get('XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'), '.cache'))
+    return os.path.join(base, 'statistical-analysis-tool')
+
+
+class SidecarCache:
+    """
+    On-disk cache of validated datasets, stored as prepared datasets (.npy blocks).
+
+    Responsible for:
+    - Deriving a cache key from a CSV's path, size, mtime and content hash
+    - Writing a loaded Dataset in the prepared dataset format
+    - Memory-mapping a previously written sidecar instead of parsing the CSV
+    - Evicting least recently used sidecars once the size limit is exceeded
+
+    Args:
+        cache_dir (str): Directory holding one sub-directory per sidecar
+        max_bytes (int): Total size allowed for all sidecars (default 2 GB)
+
+    Attributes:
+        cache_dir (str): Directory holding one sub-directory per sidecar
+        max_bytes (int): Total size allowed for all sidecars
+    """
+
+    def __init__(self, cache_dir: str = None, max_bytes: int = 2 * 1024**3):
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.max_bytes = max_bytes
+
+
+    def key_for(self, csv_path: str) -> str:
+        """Return the cache key of a CSV file from its path, size, mtime and content."""
+        path = os.path.abspath(csv_path)
+        stat = os.stat(path)
+
+        content = hashlib.blake2b(digest_size=16)
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                content.update(block)
+
+        key = hashlib.blake2b(digest_size=16)
+        key.update(f"{path}|{stat.st_size}|{stat.st_mtime_ns}|{content.hexdigest()}".encode())
+        return key.hexdigest()
+
+
+    def load(self, key: str):
+        """Return the Dataset stored under key, memory-mapped, or None when there is no usable sidecar."""
+        entry = os.path.join(self.cache_dir, key)
+        try:
+            dataset = load_dataset(entry, mmap=True)
+        except (OSError, ValueError, KeyError):
+            return None
+
+        # Mark the entry as recently used for eviction; a read-only cache still serves it
+        try:
+            os.utime(os.path.join(entry, META_FILE))
+        except OSError:
+            pass
+        return dataset
+
+
+    def store(self, key: str, dataset: Dataset):
+        """Write dataset under key. Failures to write are ignored: the cache is optional."""
+        tmp = None
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Write into a temporary directory, then rename, so readers never see half a sidecar
+            tmp = tempfile.mkdtemp(dir=self.cache_dir, prefix='.tmp-')
+            save_dataset(dataset, tmp)
+
+            entry = os.path.join(self.cache_dir, key)
+            shutil.rmtree(entry, ignore_errors=True)
+            os.replace(tmp, entry)
+        except OSError:
+            if tmp is not None:
+                shutil.rmtree(tmp, ignore_errors=True)
+            return
+
+        self.evict()
+
+
+    def evict(self):
+        """Remove least recently used sidecars until the total size fits max_bytes."""
+        if not os.path.isdir(self.cache_dir):
+            return
+
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            entry = os.path.join(self.cache_dir, name)
+            meta = os.path.join(entry, META_FILE)
+            if name.startswith('.') or not os.path.exists(meta):
+                continue
+            size = sum(entry_file.stat().st_size for entry_file in os.scandir(entry))
+            entries.append((os.path.getmtime(meta), size, entry))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+
+
+    def clear(self):
+        """Remove every sidecar."""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+
+from instrumentation import traced
+
+
+class SortedView:
+    """
+    A result table together with precomputed sort orders and its own sort state.
+
+    Responsible for:
+    - Computing, once, the ascending argsort permutation of every column
+    - Serving ascending/descending orders without sorting again
+    - Keeping the sort state (column and direction) of this table only
+
+    Missing values always come last, in both directions, as with sort_values.
+
+    Args:
+        df (pd.DataFrame): Table to sort
+
+    Attributes:
+        df (pd.DataFrame): Table in its original row order
+        sort_col (int): Index of the column the view is sorted by, or None
+        ascending (bool): Direction of the current sort
+    """
+
+    @traced(name='SortedView.build')
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self.sort_col = None
+        self.ascending = True
+
+        # Per column: (non-missing positions in ascending order, missing positions)
+        self._orders = [self._column_order(df.iloc[:, icol]) for icol in range(df.shape[1])]
+
+
+    def order(self, icol: int, ascending: bool = True) -> np.ndarray:
+        """Return the row positions of df sorted by column icol."""
+        sorted_positions, missing_positions = self._orders[icol]
+        if not ascending:
+            sorted_positions = sorted_positions[::-1]
+        return np.concatenate((sorted_positions, missing_positions))
+
+
+    def sort(self, icol: int, ascending: bool = True) -> pd.DataFrame:
+        """Sort the view by column icol and return the sorted table."""
+        self.sort_col = icol
+        self.ascending = ascending
+        return self.sorted_df()
+
+
+    @traced()
+    def toggle(self, icol: int) -> pd.DataFrame:
+        """
+        Sorts ascending by the clicked column index.
+        If the same column is clicked again, it reverses the sort order.
+        """
+        ascending = not self.ascending if self.sort_col == icol else True
+        return self.sort(icol, ascending)
+
+
+    def sorted_df(self) -> pd.DataFrame:
+        """Return the table in the current sort order."""
+        if self.sort_col is None:
+            return self.df
+        return self.df.take(self.order(self.sort_col, self.ascending))
+
+
+    @staticmethod
+    def _column_order(column: pd.Series) -> tuple:
+        missing = column.isna().to_numpy()
+        present_positions = np.flatnonzero(~missing)
+
+        values = column.to_numpy()[present_positions]
+        ascending = present_positions[np.argsort(values, kind='stable')]
+        return ascending, np.flatnonzero(missing)
@@ -0,0 +1,158 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+# A single problem found in a file. rows holds the file line numbers involved (may be empty)
+ValidationIssue = namedtuple('ValidationIssue', ['column', 'message', 'rows'])
+
+# Accept years 1900 to 2099
+YEAR_PATTERN = r'(19|20)\d{2}'
+
+# Line numbers listed per column in a non-numeric value issue
+MAX_REPORTED_ROWS = 10
+
+
+def validate_header(columns: pd.Index, country_col: str, indicator_col: str) -> list:
+    """
+    Check the label columns, the year header format and the year contiguity
+    in one pass over the header. Returns every problem found.
+    """
+    issues = []
+
+    missing = [col for col in (country_col, indicator_col) if col not in columns]
+    if missing:
+        issues.append(ValidationIssue(
+            ', '.join(missing),
+            f"The file must include {country_col} and {indicator_col}.",
+            []
+            ))
+
+    # Validate year columns (columns after first 2: COUNTRY and INDICATOR)
+    years = pd.Series(columns[2:], dtype=object).astype(str)
+    valid = years.str.fullmatch(YEAR_PATTERN).to_numpy(dtype=bool)
+
+    for year in years[~valid]:
+        issues.append(ValidationIssue(
+            year,
+            f"Invalid year column: '{year}'. Year columns must be between 1900 and 2099.",
+            []
+            ))
+
+    # Consecutive valid year columns must increase by exactly one
+    numbers = years[valid].astype(int).to_numpy()
+    for i in np.flatnonzero(np.diff(numbers) != 1):
+        issues.append(ValidationIssue(
+            str(numbers[i + 1]),
+            f"Year columns must be in strictly increasing order without gaps: "
+            f"'{numbers[i]}' is followed by '{numbers[i + 1]}'.",
+            []
+            ))
+
+    return issues
+
+
+class ChunkValidator:
+    """
+    Type checks of the CSV body, accumulated over all the chunks of a file.
+
+    Responsible for:
+    - Checking that label columns hold text and are never empty
+    - Coercing year columns to numbers and recording the lines that are not numeric
+    - Reporting every problem of the file once the last chunk was checked
+
+    Args:
+        columns (pd.Index): Validated header of the file
+        label_columns (list): Names of the text columns
+        first_line (int): File line number of the first row checked
+            (default 2, the header being line 1)
+
+    Attributes:
+        rows_seen (int): Number of body rows checked so far
+    """
+
+    def __init__(self, columns: pd.Index, label_columns: list, first_line: int = 2):
+        self.label_columns = list(label_columns)
+        self.year_columns = [col for col in columns if col not in self.label_columns]
+        self.first_line = first_line
+        self.rows_seen = 0
+
+        self._text_errors = set()
+        # Per label column: (first line numbers with a missing label, total count)
+        self._missing_labels = {}
+        # Per year column: (first offending line numbers, total count)
+        self._numeric_errors = {}
+
+
+    def check(self, chunk: pd.DataFrame) -> np.ndarray:
+        """
+        Check one chunk and return its year values as a float block.
+        Values that are not numeric become NaN and are reported by issues().
+        """
+        first_line = self.first_line + self.rows_seen
+        self.rows_seen += len(chunk)
+
+        for col, t in chunk.dtypes[self.label_columns].items():
+            # A chunk with only missing labels is parsed as float, not as text
+            if not pd.api.types.is_string_dtype(t) and not chunk[col].isna().all():
+                self._text_errors.add(col)
+
+            missing = np.flatnonzero(chunk[col].isna().to_numpy()) + first_line
+            if len(missing):
+                self._add_lines(self._missing_labels, col, missing)
+
+        block = chunk[self.year_columns]
+        if block.empty:
+            return np.empty(block.shape)
+
+        non_numeric = [col for col, t in block.dtypes.items() if not pd.api.types.is_numeric_dtype(t)]
+        if not non_numeric:
+            return block.to_numpy(dtype=float)
+
+        coerced = block.copy()
+        coerced[non_numeric] = block[non_numeric].apply(pd.to_numeric, errors='coerce')
+        bad = coerced[non_numeric].isna().to_numpy() & block[non_numeric].notna().to_numpy()
+
+        for col, column_bad in zip(non_numeric, bad.T):
+            lines = np.flatnonzero(column_bad) + first_line
+            if len(lines):
+                self._add_lines(self._numeric_errors, col, lines)
+
+        return coerced.to_numpy(dtype=float)
+
+
+    @staticmethod
+    def _add_lines(errors: dict, col: str, lines: np.ndarray):
+        """Record offending line numbers of a column, keeping only the first ones."""
+        reported, count = errors.get(col, ([], 0))
+        reported = reported + lines[:MAX_REPORTED_ROWS - len(reported)].tolist()
+        errors[col] = (reported, count + len(lines))
+
+
+    def issues(self) -> list:
+        """Return every problem found in the chunks checked so far."""
+        issues = [
+            ValidationIssue(col, f"Column '{col}' must be of type text.", [])
+            for col in self.label_columns if col in self._text_errors
+            ]
+
+        for col in self.label_columns:
+            if col in self._missing_labels:
+                issues.append(self._lines_issue(
+                    col, self._missing_labels[col], f"Column '{col}' must not be empty. Missing values"
+                    ))
+
+        for col in self.year_columns:
+            if col in self._numeric_errors:
+                issues.append(self._lines_issue(
+                    col, self._numeric_errors[col], f"Column '{col}' must be a numeric type. Non-numeric values"
+                    ))
+        return issues
+
+
+    @staticmethod
+    def _lines_issue(col: str, errors: tuple, message: str) -> ValidationIssue:
+        reported, count = errors
+        lines = ', '.join(str(line) for line in reported)
+        more = f" (and {count - len(reported)} more)" if count > len(reported) else ""
+        return ValidationIssue(col, f"{message} on line(s) {lines}{more}.", reported)
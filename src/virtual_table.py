@@ -0,0 +1,142 @@
+from tkinter import ttk
+
+
+class VirtualTable:
+    """
+    Virtualized rendering of a large DataFrame into a ttk.Treeview.
+
+    Only a fixed pool of items, enough to fill the viewport plus a small buffer,
+    ever exists in the Treeview. Scrolling re-fills those items with the rows of
+    the new window, so render time does not depend on the number of rows.
+
+    Args:
+        treeview (ttk.Treeview): Table widget to render into
+        scroll_bar (tk.Scrollbar): Vertical scrollbar driven by the table
+        format_row (callable): format_row(position, row) -> (values, tags) for one row
+        buffer (int): Extra rows rendered below the viewport (default 5)
+
+    Attributes:
+        df (pd.DataFrame): Frame holding every row of the table
+        positions (list): Row positions of df currently shown, in display order
+        first (int): Index in positions of the first row in the viewport
+    """
+
+    def __init__(self, treeview, scroll_bar, format_row, buffer=5):
+        self.treeview = treeview
+        self.scroll_bar = scroll_bar
+        self.format_row = format_row
+        self.buffer = buffer
+
+        self.df = None
+        self.positions = []
+        self.first = 0
+
+        self._pool = []
+
+
+    def set_rows(self, df, positions=None):
+        """Show the rows of df (optionally only the given positions) from the top."""
+        self.df = df
+        self.positions = list(range(len(df))) if positions is None else list(positions)
+        self.first = 0
+        self.render()
+
+
+    def set_positions(self, positions):
+        """Change which rows of the current frame are shown, keeping the frame."""
+        self.positions = list(positions)
+        self.first = 0
+        self.render()
+
+
+    def clear(self):
+        """Remove the pool items from the Treeview."""
+        if self._pool:
+            self.treeview.delete(*self._pool)
+        self._pool = []
+        self.df = None
+        self.positions = []
+
+
+    def visible_rows(self) -> int:
+        """Number of rows that fit in the Treeview viewport."""
+        height = self.treeview.winfo_height()
+        row_height = self._row_height()
+
+        # Before the widget is mapped its height is unknown, use the configured one
+        fitting = (height // row_height) - 1 if height > 1 else 0
+        return max(int(self.treeview.cget('height')), fitting, 1)
+
+
+    def render(self):
+        """Fill the item pool with the rows of the current window."""
+        if self.df is None:
+            return
+
+        visible = self.visible_rows()
+        self._resize_pool(visible + self.buffer)
+        self.first = max(0, min(self.first, len(self.positions) - visible))
+
+        window = self.positions[self.first:self.first + len(self._pool)]
+        rows = self.df.iloc[window].itertuples(index=False)
+
+        for offset, (item_id, row) in enumerate(zip(self._pool, rows)):
+            values, tags = self.format_row(self.first + offset, row)
+            self.treeview.item(item_id, values=values, tags=tags)
+            self.treeview.move(item_id, '', offset)
+
+        # Items past the last row are hidden rather than destroyed
+        unused = self._pool[len(window):]
+        if unused:
+            self.treeview.detach(*unused)
+
+        self._update_scroll_bar(visible)
+
+
+    def yview(self, *args):
+        """Scrollbar command: scroll the window by units/pages or move it to a fraction."""
+        visible = self.visible_rows()
+
+        if args[0] == 'moveto':
+            self.first = int(float(args[1]) * len(self.positions))
+        elif args[0] == 'scroll':
+            step = visible if args[2] == 'pages' else 1
+            self.first += int(args[1]) * step
+
+        self.render()
+
+
+    def on_mousewheel(self, event):
+        """Scroll the window with the mouse wheel instead of the Treeview's own scrolling."""
+        if event.num == 4 or event.delta > 0:
+            self.yview('scroll', -3, 'units')
+        else:
+            self.yview('scroll', 3, 'units')
+        return 'break'
+
+
+    def _resize_pool(self, size: int):
+        """Create or delete pool items so exactly size items exist."""
+        while len(self._pool) < size:
+            self._pool.append(self.treeview.insert('', 'end'))
+
+        if len(self._pool) > size:
+            self.treeview.delete(*self._pool[size:])
+            del self._pool[size:]
+
+
+    def _row_height(self) -> int:
+        style = self.treeview.cget('style') or 'Treeview'
+        row_height = ttk.Style().lookup(style, 'rowheight')
+        try:
+            return max(int(row_height), 1)
+        except (TypeError, ValueError):
+            return 20
+
+
+    def _update_scroll_bar(self, visible: int):
+        total = len(self.positions)
+        if total == 0:
+            self.scroll_bar.set(0, 1)
+        else:
+            self.scroll_bar.set(self.first / total, min((self.first + visible) / total, 1))
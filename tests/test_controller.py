@@ -0,0 +1,22 @@
+import instrumentation
+from controller import AppController
+from data_handler import DataHandler
+from instrumentation import Tracer
+
+
+def test_load_worker_span_counts_dataset_rows(tmp_path, monkeypatch):
+    first = tmp_path / 'first.csv'
+    first.write_text("COUNTRY,INDICATOR,2000,2001\nX,A,1,2\nY,A,3,4\nX,B,5,6\n")
+    second = tmp_path / 'second.csv'
+    second.write_text("COUNTRY,INDICATOR,2000,2001\nZ,A,7,8\n")
+
+    tracer = Tracer(enabled=True)
+    monkeypatch.setattr(instrumentation, 'tracer', tracer)
+    controller = AppController(DataHandler())
+
+    # A single file also returns its state; several files return None instead
+    for paths in ([str(first)], [str(first), str(second)]):
+        tracer.spans.clear()
+        dataset = controller._load_worker(paths, None, None)[2]
+        (span,) = [span for span in tracer.spans if span.name == 'AppController._load_worker']
+        assert span.rows == len(dataset)
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from correlation import MIN_OBSERVATIONS, correlation_matrix, indicator_observations
+from dataset import Dataset
+from indicator_stats import percent_change
+
+
+def naive_correlation(observations: np.ndarray) -> np.ndarray:
+    """Pearson correlation of each pair of columns over the rows where both are present."""
+    n_columns = observations.shape[1]
+    expected = np.full((n_columns, n_columns), np.nan)
+    for i in range(n_columns):
+        for j in range(n_columns):
+            both = ~np.isnan(observations[:, i]) & ~np.isnan(observations[:, j])
+            x, y = observations[both, i], observations[both, j]
+            if both.sum() >= MIN_OBSERVATIONS and np.ptp(x) > 0 and np.ptp(y) > 0:
+                expected[i, j] = np.corrcoef(x, y)[0, 1]
+    return expected
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_correlation_matrix_matches_pairwise_complete_corrcoef(seed):
+    rng = np.random.default_rng(seed)
+    n_rows, n_columns = int(rng.integers(2, 40)), int(rng.integers(1, 8))
+    observations = rng.normal(rng.normal(0, 1e3, n_columns), rng.uniform(0.1, 10, n_columns), (n_rows, n_columns))
+    observations[rng.random(observations.shape) < rng.uniform(0, 0.6)] = np.nan
+
+    # Exactly correlated, constant and empty columns
+    if n_columns > 2:
+        observations[:, 1] = 3 * observations[:, 0] - 7
+        observations[:, 2] = np.where(np.isnan(observations[:, 2]), np.nan, 0.1)
+    observations[:, -1][rng.random(n_rows) < 0.5] = np.nan
+
+    np.testing.assert_allclose(correlation_matrix(observations), naive_correlation(observations),
+                               rtol=1e-9, atol=1e-9)
+
+
+def test_correlation_matrix_column_constant_over_common_rows():
+    rng = np.random.default_rng(0)
+    for n_common in range(MIN_OBSERVATIONS, 40):
+        constant = np.r_[np.full(n_common, rng.normal(0, 100)), rng.normal(0, 1e3, 5)]
+        other = np.r_[rng.normal(0, 1, n_common), np.full(5, np.nan)]
+        assert np.isnan(correlation_matrix(np.column_stack([constant, other]))[0, 1])
+
+
+def test_indicator_observations_match_rows():
+    rng = np.random.default_rng(0)
+    countries = np.array(['AT', 'BE', 'CH', 'DE'], dtype=object)
+    indicators = np.array(['CO2', 'GDP', 'POP'], dtype=object)
+    pairs = [(i, c) for i in range(3) for c in range(4) if (i, c) != (1, 2)]
+    values = rng.integers(0, 5, (len(pairs), 6)).astype(float)
+    values[rng.random(values.shape) < 0.2] = np.nan
+    dataset = Dataset.from_rows(
+        np.array([c for _, c in pairs], dtype=np.int32), np.array([i for i, _ in pairs], dtype=np.int32),
+        values.copy(), countries, indicators, [str(year) for year in range(2000, 2006)], 'COUNTRY', 'INDICATOR'
+        )
+
+    start, end = 1, 4
+    delta = indicator_observations(dataset, start, end, 'delta')
+    yoy = indicator_observations(dataset, start, end, 'yoy').reshape(len(countries), end - start, len(indicators))
+
+    expected_delta = np.full((len(countries), len(indicators)), np.nan)
+    expected_yoy = np.full((len(countries), end - start, len(indicators)), np.nan)
+    for (i, c), row in zip(pairs, values):
+        expected_delta[c, i] = percent_change(row[start], row[end])
+        expected_yoy[c, :, i] = percent_change(row[start:end], row[start + 1:end + 1])
+
+    np.testing.assert_array_equal(delta, expected_delta)
+    np.testing.assert_array_equal(yoy, expected_yoy)
+
+    with pytest.raises(ValueError):
+        indicator_observations(dataset, start, end, 'levels')
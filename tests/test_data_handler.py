@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from data_handler import DataHandler, InvalidFileFormatError
+
+
+def assert_same_dataset(actual, expected):
+    for name in ('countries', 'indicators', 'years', 'indptr', 'country_codes'):
+        np.testing.assert_array_equal(getattr(actual, name), getattr(expected, name), err_msg=name)
+    np.testing.assert_array_equal(np.asarray(actual.values), np.asarray(expected.values))
+
+
+def test_read_appended_matches_full_read(tmp_path):
+    path = tmp_path / 'data.csv'
+    path.write_text("COUNTRY,INDICATOR,2000,2001\nX,A,1,2\nY,A,3,4\nX,B,5,\n")
+    handler = DataHandler()
+    dataset = handler.read_dataset(str(path), use_cache=False)
+    start = path.stat().st_size
+
+    # A repeated pair with a now missing value, a new country and a new indicator
+    with open(path, 'a') as f:
+        f.write("X,A,10,\nZ,B,7,8\nY,C,,9\n")
+
+    appended = handler.read_appended(str(path), dataset, start, path.stat().st_size)
+    assert_same_dataset(appended, handler.read_dataset(str(path), use_cache=False))
+
+    _, values = appended.indicator_block('A')
+    np.testing.assert_array_equal(values[0], [10, np.nan])
+
+
+def test_read_appended_reports_file_line_numbers(tmp_path):
+    path = tmp_path / 'data.csv'
+    path.write_text("COUNTRY,INDICATOR,2000,2001\n" + "".join(f"C{i},A,1,2\n" for i in range(50)))
+    handler = DataHandler()
+    dataset = handler.read_dataset(str(path), use_cache=False)
+    start = path.stat().st_size
+
+    with open(path, 'a') as f:
+        f.write("X,B,1,2\nY,B,one,2\n")
+
+    with pytest.raises(InvalidFileFormatError) as error:
+        handler.read_appended(str(path), dataset, start, path.stat().st_size)
+    assert error.value.issues[0].rows == [53]
@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+
+from dataset import Dataset, MergeConflictError, merge_datasets
+
+
+def random_dataset(rng, first_year: int, n_years: int, missing: float = 0.3) -> Dataset:
+    """Dataset of random (indicator, country) pairs with some missing values."""
+    countries = np.array(sorted(rng.choice(['AT', 'BE', 'CH', 'DE', 'ES', 'FR', 'IT'], 5, replace=False)), dtype=object)
+    indicators = np.array(sorted(rng.choice(['GDP', 'POP', 'CO2', 'LIFE'], 3, replace=False)), dtype=object)
+
+    pairs = [(i, c) for i in range(len(indicators)) for c in range(len(countries)) if rng.random() < 0.7]
+    order = rng.permutation(len(pairs))
+    indicator_codes = np.array([pairs[k][0] for k in order], dtype=np.int32)
+    country_codes = np.array([pairs[k][1] for k in order], dtype=np.int32)
+
+    # Small integers so that overlapping cells sometimes agree
+    values = rng.integers(0, 4, (len(pairs), n_years)).astype(float)
+    values[rng.random(values.shape) < missing] = np.nan
+
+    years = [str(year) for year in range(first_year, first_year + n_years)]
+    return Dataset.from_rows(country_codes, indicator_codes, values, countries, indicators, years,
+                             'COUNTRY', 'INDICATOR')
+
+
+def cells(dataset: Dataset) -> dict:
+    """{(indicator, country): {year: value}} of every row of dataset, NaN included."""
+    indicator_codes = dataset.row_indicator_codes()
+    return {
+        (dataset.indicators[i], dataset.countries[c]): dict(zip(dataset.years, np.asarray(row, dtype=float)))
+        for i, c, row in zip(indicator_codes, dataset.country_codes, dataset.values)
+        }
+
+
+def naive_merge(datasets: list, conflict: str) -> dict:
+    """Reference of merge_datasets, one cell at a time."""
+    merged = {}
+    for dataset in datasets:
+        for pair, row in cells(dataset).items():
+            merged_row = merged.setdefault(pair, {})
+            for year, value in row.items():
+                current = merged_row.get(year, np.nan)
+                if np.isnan(value):
+                    continue
+                if np.isnan(current) or conflict == 'last':
+                    merged_row[year] = value
+                elif conflict == 'error' and current != value:
+                    raise MergeConflictError(pair)
+    return merged
+
+
+@pytest.mark.parametrize('seed', range(20))
+@pytest.mark.parametrize('conflict', ['last', 'first', 'error'])
+def test_merge_datasets_matches_naive_merge(seed, conflict):
+    rng = np.random.default_rng(seed)
+    datasets = [random_dataset(rng, int(rng.integers(2000, 2004)), int(rng.integers(1, 6))) for _ in range(3)]
+
+    try:
+        expected = naive_merge(datasets, conflict)
+    except MergeConflictError:
+        with pytest.raises(MergeConflictError):
+            merge_datasets(datasets, conflict)
+        return
+
+    merged = merge_datasets(datasets, conflict)
+    first_year = min(int(dataset.years[0]) for dataset in datasets)
+    last_year = max(int(dataset.years[-1]) for dataset in datasets)
+    assert list(merged.years) == [str(year) for year in range(first_year, last_year + 1)]
+
+    # Rows are sorted by indicator then country, as the CSR layout requires
+    keys = merged.row_indicator_codes() * len(merged.countries) + merged.country_codes
+    assert np.all(np.diff(keys) > 0)
+
+    actual = cells(merged)
+    assert actual.keys() == expected.keys()
+    for pair, row in actual.items():
+        for year, value in row.items():
+            np.testing.assert_equal(value, expected[pair].get(year, np.nan), err_msg=f"{pair} {year}")
+
+
+def test_from_rows_keeps_last_duplicate_row():
+    values = np.array([[1.0, 2.0], [5.0, np.nan], [3.0, 4.0]])
+    dataset = Dataset.from_rows(
+        np.array([0, 1, 0], dtype=np.int32), np.array([0, 0, 0], dtype=np.int32), values,
+        np.array(['X', 'Y'], dtype=object), np.array(['A'], dtype=object), ['2000', '2001'],
+        'COUNTRY', 'INDICATOR'
+        )
+
+    country_codes, block = dataset.indicator_block('A')
+    assert country_codes.tolist() == [0, 1]
+    np.testing.assert_array_equal(block, [[3.0, 4.0], [5.0, np.nan]])
+
+
+def test_merge_error_accepts_overlaps_that_agree():
+    rng = np.random.default_rng(0)
+    dataset = random_dataset(rng, 2000, 5)
+    # Same cells with more of them missing: every overlap agrees
+    values = dataset.values.copy()
+    values[rng.random(values.shape) < 0.5] = np.nan
+    sparser = Dataset(dataset.countries, dataset.indicators, dataset.years, dataset.indptr,
+                      dataset.country_codes, values, 'COUNTRY', 'INDICATOR')
+
+    merged = merge_datasets([sparser, dataset], 'error')
+    np.testing.assert_array_equal(merged.values, dataset.values)
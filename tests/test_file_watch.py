@@ -0,0 +1,20 @@
+from file_watch import read_file_state, rows_appended
+
+
+def test_rows_appended(tmp_path):
+    path = tmp_path / 'data.csv'
+    path.write_text("COUNTRY,INDICATOR,2000,2001\nX,A,1,2\n")
+    old = read_file_state(str(path))
+
+    # A last line still being written is not a row yet
+    with open(path, 'a') as f:
+        f.write("X,Q,5")
+    assert not rows_appended(str(path), old, read_file_state(str(path)))
+
+    with open(path, 'a') as f:
+        f.write(",6\n")
+    assert rows_appended(str(path), old, read_file_state(str(path)))
+
+    # The rows before the old end changed
+    path.write_text("COUNTRY,INDICATOR,2000,2001\nX,A,1,3\nX,Q,5,6\n")
+    assert not rows_appended(str(path), old, read_file_state(str(path)))
@@ -0,0 +1,82 @@
+import warnings
+
+import numpy as np
+import pytest
+
+from indicator_stats import percent_change
+from range_tables import RangeTables
+
+
+def random_block(rng, n_rows: int, n_years: int, offset: float = 0.0) -> np.ndarray:
+    """Random year values with missing values, ties and zeros."""
+    values = rng.integers(-3, 6, (n_rows, n_years)).astype(float) + offset
+    values[rng.random(values.shape) < 0.3] = np.nan
+    # Rows with every value missing, or a single value
+    values[0] = np.nan
+    values[1, 1:] = np.nan
+    return values
+
+
+def naive_extreme(row: np.ndarray, years: np.ndarray, pick) -> tuple:
+    """Extreme value of row and the first year it is reached, NaN if row is all missing."""
+    if np.isnan(row).all():
+        return np.nan, np.nan
+    value = pick(row)
+    return value, years[np.flatnonzero(row == value)[0]]
+
+
+def naive_volatility(row: np.ndarray) -> float:
+    changes = percent_change(row[:-1], row[1:])
+    changes = changes[~np.isnan(changes)]
+    return np.std(changes, ddof=1) if len(changes) > 1 else np.nan
+
+
+def change_scale(values: np.ndarray) -> np.ndarray:
+    """Largest year-over-year change of each row: prefix sums lose precision relative to it."""
+    changes = np.abs(percent_change(values[:, :-1], values[:, 1:]))
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        return np.nan_to_num(np.nanmax(changes, axis=1, initial=0))
+
+
+@pytest.mark.parametrize('seed', range(10))
+@pytest.mark.parametrize('offset', [0.0, 1e6])
+def test_range_tables_match_naive_aggregates(seed, offset):
+    rng = np.random.default_rng(seed)
+    n_years = int(rng.integers(1, 20))
+    values = random_block(rng, 12, n_years, offset)
+    years = np.arange(1990, 1990 + n_years).astype(str)
+    tables = RangeTables(values, years)
+    tolerance = 1e-6 * change_scale(values) + 1e-12
+
+    for start in range(n_years):
+        for end in range(start, n_years):
+            window = values[:, start:end + 1]
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', RuntimeWarning)
+                expected_mean = np.nanmean(window, axis=1)
+            expected_min = [naive_extreme(row, years[start:end + 1].astype(float), np.nanmin) for row in window]
+            expected_max = [naive_extreme(row, years[start:end + 1].astype(float), np.nanmax) for row in window]
+            expected_volatility = [naive_volatility(row) for row in window]
+
+            np.testing.assert_allclose(tables.mean(start, end), expected_mean, rtol=1e-9)
+            volatility = tables.volatility(start, end)
+            np.testing.assert_array_equal(np.isnan(volatility), np.isnan(expected_volatility))
+            assert np.all(np.abs(volatility - expected_volatility)[~np.isnan(volatility)]
+                          <= tolerance[~np.isnan(volatility)])
+            np.testing.assert_array_equal(np.column_stack(tables.minimum(start, end)), expected_min)
+            np.testing.assert_array_equal(np.column_stack(tables.maximum(start, end)), expected_max)
+
+
+def test_range_tables_rows_selection():
+    rng = np.random.default_rng(0)
+    values = random_block(rng, 20, 9)
+    tables = RangeTables(values, np.arange(2000, 2009).astype(str))
+    rows = np.array([3, 0, 17, 5])
+
+    for start, end in [(0, 8), (2, 6), (4, 4)]:
+        np.testing.assert_array_equal(tables.mean(start, end, rows), tables.mean(start, end)[rows])
+        np.testing.assert_array_equal(tables.volatility(start, end, rows), tables.volatility(start, end)[rows])
+        for query in (tables.minimum, tables.maximum):
+            for selected, full in zip(query(start, end, rows), query(start, end)):
+                np.testing.assert_array_equal(selected, full[rows])